@@ -4,13 +4,264 @@
 과거 데이터를 사용하여 거래 전략의 성과를 검증
 """
 
+import os
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import logging
 from binance_client import BinanceClient
 from trading_strategy import GoldenCrossStrategy
 from config import Config
+from numba_compat import njit
+
+logger = logging.getLogger(__name__)
+
+# 거래 유형 코드 (컴파일된 코어에서 사용)
+TRADE_BUY = 0
+TRADE_SELL = 1
+
+# 포지션 코드 (자본 = 잔고 + 포지션 * 수량 * 가격)
+POS_NONE = 0
+POS_LONG = 1
+POS_SHORT = -1
+
+# 거래 내역 레코드 형식
+TRADE_DTYPE = np.dtype([
+    ('timestamp', 'datetime64[ns]'),
+    ('type', np.int8),
+    ('price', np.float64),
+    ('size', np.float64),
+    ('profit', np.float64),
+    ('balance', np.float64)
+])
+
+# 명시적 시그니처로 임포트 시점에 컴파일 (첫 실행 시 JIT 지연 제거)
+_BACKTEST_CORE_SIGNATURE = (
+    'Tuple((i8[:], i1[:], f8[:], f8[:], f8[:], f8[:], f8[:], i8[:]))'
+    '(f4[:], b1[:], b1[:], i8, f8, f8, f8)'
+)
+
+@njit(_BACKTEST_CORE_SIGNATURE, cache=True)
+def _backtest_core(closes, buy_sig, sell_sig, long_period, stop_mul, tp_mul, initial_balance):
+    """
+    바 단위 백테스팅 코어 (Numba로 컴파일)
+    
+    Args:
+        closes (np.ndarray): 종가 배열 (float32)
+        buy_sig (np.ndarray): 매수 신호 배열
+        sell_sig (np.ndarray): 매도 신호 배열 (매도 신호 또는 강제 청산)
+        long_period (int): 장기 이동평균선 기간 (루프 시작 인덱스)
+        stop_mul (float): 진입가 대비 손절매 가격 배수
+        tp_mul (float): 진입가 대비 익절매 가격 배수
+        initial_balance (float): 초기 자본
+        
+    Returns:
+        tuple: 거래 내역 배열(인덱스, 유형, 가격, 수량, 수익, 잔고)과
+               자본 곡선 배열(자본, 인덱스)
+    """
+    n = closes.shape[0]
+    
+    # 결과 배열 사전 할당 (거래는 최대 바 개수 + 마지막 청산 1회)
+    trade_idx = np.empty(n + 1, np.int64)
+    trade_type = np.empty(n + 1, np.int8)
+    trade_price = np.empty(n + 1, np.float64)
+    trade_size = np.empty(n + 1, np.float64)
+    trade_profit = np.empty(n + 1, np.float64)
+    trade_balance = np.empty(n + 1, np.float64)
+    equity = np.empty(n, np.float64)
+    equity_idx = np.empty(n, np.int64)
+    
+    balance = initial_balance
+    position = np.int8(POS_NONE)
+    size = 0.0
+    entry = 0.0
+    stop_loss = 0.0
+    take_profit = 0.0
+    nt = 0
+    ne = 0
+    
+    for i in range(long_period, n):
+        # 가격은 float32로 저장하고 잔고/수익 누적은 float64로 계산
+        price = np.float64(closes[i])
+        
+        if position == POS_LONG:
+            # 손절매/익절매 또는 매도 신호 시 청산
+            hit = price <= stop_loss or price >= take_profit
+            if hit or sell_sig[i]:
+                amount = size * price
+                balance += amount
+                
+                trade_idx[nt] = i
+                trade_type[nt] = TRADE_SELL
+                trade_price[nt] = price
+                trade_size[nt] = size
+                trade_profit[nt] = amount - size * entry
+                trade_balance[nt] = balance
+                nt += 1
+                
+                position = np.int8(POS_NONE)
+                size = 0.0
+                entry = 0.0
+                
+                # 손절매/익절매 바는 자본 곡선에 기록하지 않음
+                if hit:
+                    continue
+        elif buy_sig[i]:
+            # 잔고의 90%로 매수
+            amount = balance * 0.9
+            size = amount / price
+            balance -= amount
+            entry = price
+            stop_loss = entry * stop_mul
+            take_profit = entry * tp_mul
+            position = np.int8(POS_LONG)
+            
+            trade_idx[nt] = i
+            trade_type[nt] = TRADE_BUY
+            trade_price[nt] = price
+            trade_size[nt] = size
+            trade_profit[nt] = 0.0
+            trade_balance[nt] = balance
+            nt += 1
+        
+        # 자본 곡선 업데이트 (포지션 코드로 분기 없이 계산)
+        equity[ne] = balance + position * size * price
+        equity_idx[ne] = i
+        ne += 1
+    
+    # 마지막 포지션 정리
+    if position == POS_LONG:
+        price = np.float64(closes[n - 1])
+        amount = size * price
+        balance += amount
+        
+        trade_idx[nt] = n - 1
+        trade_type[nt] = TRADE_SELL
+        trade_price[nt] = price
+        trade_size[nt] = size
+        trade_profit[nt] = amount - size * entry
+        trade_balance[nt] = balance
+        nt += 1
+    
+    return (trade_idx[:nt], trade_type[:nt], trade_price[:nt], trade_size[:nt],
+            trade_profit[:nt], trade_balance[:nt], equity[:ne], equity_idx[:ne])
+
+@njit('i8(f4[:], i8, i8, f8, f8)', cache=True)
+def _first_breach(closes, start, stop, stop_loss, take_profit):
+    """
+    구간 [start, stop)에서 손절매/익절매 가격에 처음 도달한 바 탐색 (도달 즉시 중단)
+    
+    Args:
+        closes (np.ndarray): 종가 배열 (float32)
+        start (int): 탐색 시작 인덱스
+        stop (int): 탐색 종료 인덱스 (미포함)
+        stop_loss (float): 손절매 가격
+        take_profit (float): 익절매 가격
+        
+    Returns:
+        int: 처음 도달한 바 인덱스 (도달하지 않으면 -1)
+    """
+    for i in range(start, stop):
+        price = np.float64(closes[i])
+        if price <= stop_loss or price >= take_profit:
+            return i
+    return -1
+
+def _vectorized_core(closes, buy_sig, sell_sig, long_period, stop_mul, tp_mul, initial_balance):
+    """
+    벡터화 백테스팅 (바 단위 파이썬 루프 없이 _backtest_core와 같은 결과 계산)
+    
+    진입/청산 시점은 거래 단위로만 탐색하고(손절매/익절매 탐색은 첫 도달 바에서
+    중단하므로 전체 탐색량은 바 개수에 비례), 잔고는 거래별 수익 배수의
+    누적곱으로, 자본 곡선은 배열 연산으로 계산
+    
+    Args:
+        _backtest_core와 동일
+        
+    Returns:
+        tuple: _backtest_core와 동일한 형식의 결과 배열
+    """
+    n = len(closes)
+    buy_idx = np.flatnonzero(buy_sig[long_period:]) + long_period
+    sell_idx = np.flatnonzero(sell_sig[long_period:]) + long_period
+    
+    # 진입/청산 시점 탐색 (거래당 한 번)
+    entries = []
+    exits = []
+    hits = []
+    cursor = long_period
+    while True:
+        k = np.searchsorted(buy_idx, cursor)
+        if k == len(buy_idx):
+            break
+        entry = buy_idx[k]
+        
+        # 진입 이후 첫 매도 신호 (없으면 마지막 바에서 청산)
+        m = np.searchsorted(sell_idx, entry + 1)
+        next_sell = sell_idx[m] if m < len(sell_idx) else n
+        
+        # 매도 신호 바까지 손절매/익절매 도달 여부 확인
+        entry_price = np.float64(closes[entry])
+        exit_i = _first_breach(closes, entry + 1, min(next_sell + 1, n),
+                               entry_price * stop_mul, entry_price * tp_mul)
+        
+        hit = exit_i >= 0
+        if not hit:
+            exit_i = min(next_sell, n - 1)
+        
+        entries.append(entry)
+        exits.append(exit_i)
+        hits.append(hit)
+        cursor = exit_i + 1
+    
+    entries = np.asarray(entries, dtype=np.int64)
+    exits = np.asarray(exits, dtype=np.int64)
+    hits = np.asarray(hits, dtype=np.bool_)
+    
+    # 거래별 잔고 (잔고의 90% 투입 → 수익 배수의 누적곱, float64로 누적)
+    entry_prices = closes[entries].astype(np.float64)
+    exit_prices = closes[exits].astype(np.float64)
+    balance_after = initial_balance * np.cumprod(0.1 + 0.9 * exit_prices / entry_prices)
+    balance_before = np.concatenate(([initial_balance], balance_after))[:-1]
+    sizes = balance_before * 0.9 / entry_prices
+    cash = balance_before * 0.1
+    profits = sizes * (exit_prices - entry_prices)
+    
+    # 매수/매도 거래를 교대로 배치
+    nt = 2 * len(entries)
+    trade_idx = np.empty(nt, np.int64)
+    trade_type = np.empty(nt, np.int8)
+    trade_price = np.empty(nt, np.float64)
+    trade_size = np.empty(nt, np.float64)
+    trade_profit = np.zeros(nt, np.float64)
+    trade_balance = np.empty(nt, np.float64)
+    
+    trade_idx[0::2], trade_idx[1::2] = entries, exits
+    trade_type[0::2], trade_type[1::2] = TRADE_BUY, TRADE_SELL
+    trade_price[0::2], trade_price[1::2] = entry_prices, exit_prices
+    trade_size[0::2], trade_size[1::2] = sizes, sizes
+    trade_profit[1::2] = profits
+    trade_balance[0::2], trade_balance[1::2] = cash, balance_after
+    
+    # 자본 곡선: 보유 구간은 현금 + 평가액, 그 외는 직전 청산 후 잔고
+    bars = np.arange(long_period, n)
+    equity = np.concatenate(([initial_balance], balance_after))[
+        np.searchsorted(exits, bars, side='right')
+    ]
+    
+    if len(entries):
+        last_entry = np.searchsorted(entries, bars, side='right') - 1
+        holding = (last_entry >= 0) & (bars < exits[np.maximum(last_entry, 0)])
+        j = last_entry[holding]
+        equity[holding] = cash[j] + sizes[j] * closes[bars[holding]]
+    
+    # 손절매/익절매 바는 자본 곡선에서 제외
+    keep = np.ones(len(bars), dtype=np.bool_)
+    keep[exits[hits] - long_period] = False
+    
+    return (trade_idx, trade_type, trade_price, trade_size,
+            trade_profit, trade_balance, equity[keep], bars[keep])
 
 class BacktestEngine:
     def __init__(self, initial_balance=10000):
@@ -22,14 +273,16 @@ class BacktestEngine:
         """
         self.initial_balance = initial_balance
         self.balance = initial_balance
-        self.position = None
-        self.position_size = 0
-        self.entry_price = 0
         
-        self.trades = []
-        self.equity_curve = []
+        # 거래 내역 (구조화 배열)
+        self.trades = np.zeros(0, dtype=TRADE_DTYPE)
+        
+        # 자본 곡선 (Struct-of-Arrays)
+        self.equity_timestamps = np.empty(0, dtype='datetime64[ns]')
+        self.equity = np.empty(0, dtype=np.float64)
+        self.equity_prices = np.empty(0, dtype=np.float64)
         
-        self.logger = logging.getLogger(__name__)
+        self._debug = logger.isEnabledFor(logging.DEBUG)
         
         # 백테스팅 결과
         self.results = {
@@ -43,7 +296,8 @@ class BacktestEngine:
             'profit_factor': 0.0
         }
     
-    def run_backtest(self, symbol, timeframe, start_date, end_date):
+    def run_backtest(self, symbol, timeframe, start_date, end_date,
+                     short_period=None, long_period=None, verbose=True, vectorized=False):
         """
         백테스팅 실행
         
@@ -52,21 +306,25 @@ class BacktestEngine:
             timeframe (str): 시간 프레임
             start_date (str): 시작 날짜 (YYYY-MM-DD)
             end_date (str): 종료 날짜 (YYYY-MM-DD)
+            short_period (int): 단기 이동평균선 기간 (기본값: Config 설정)
+            long_period (int): 장기 이동평균선 기간 (기본값: Config 설정)
+            verbose (bool): 결과 출력 여부
+            vectorized (bool): 벡터화 백테스팅 사용 여부 (기본값인 컴파일된 바 단위 코어가 더 빠름)
         """
         try:
-            self.logger.info(f"백테스팅 시작: {symbol} {timeframe} ({start_date} ~ {end_date})")
+            logger.info(f"백테스팅 시작: {symbol} {timeframe} ({start_date} ~ {end_date})")
             
             # 전략 초기화
             strategy = GoldenCrossStrategy(
-                short_period=Config.SHORT_MA_PERIOD,
-                long_period=Config.LONG_MA_PERIOD
+                short_period=short_period or Config.SHORT_MA_PERIOD,
+                long_period=long_period or Config.LONG_MA_PERIOD
             )
             
             # 과거 데이터 가져오기
             df = self.get_historical_data(symbol, timeframe, start_date, end_date)
             
             if df is None or len(df) < strategy.long_period:
-                self.logger.error("데이터 부족으로 백테스팅 불가")
+                logger.error("데이터 부족으로 백테스팅 불가")
                 return None
             
             # 지표 계산
@@ -74,26 +332,62 @@ class BacktestEngine:
             df = strategy.generate_signals(df)
             
             # 백테스팅 실행
-            self.execute_backtest(df, strategy)
+            if vectorized:
+                self.execute_backtest_vectorized(df, strategy)
+            else:
+                self.execute_backtest(df, strategy)
             
             # 결과 계산
             self.calculate_results()
             
             # 결과 출력
-            self.print_results()
+            if verbose:
+                self.print_results()
             
             return self.results
             
         except Exception as e:
-            self.logger.error(f"백테스팅 실행 실패: {e}")
+            logger.error(f"백테스팅 실행 실패: {e}")
             return None
     
+    def run_parallel_backtests(self, configs, max_workers=None):
+        """
+        여러 설정의 백테스팅을 프로세스 풀에서 병렬 실행
+        
+        Args:
+            configs (list): run_single_backtest에 전달할 설정 딕셔너리 목록
+            max_workers (int): 최대 프로세스 수 (기본값: CPU 코어 수)
+            
+        Returns:
+            list: configs 순서대로 정렬된 결과 목록
+        """
+        results = [None] * len(configs)
+        
+        logger.info(f"병렬 백테스팅 시작: {len(configs)}개 설정")
+        
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            futures = {
+                executor.submit(run_single_backtest, params): i
+                for i, params in enumerate(configs)
+            }
+            
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    logger.error(f"병렬 백테스팅 작업 실패 ({configs[i]}): {e}")
+                    results[i] = {'params': configs[i], 'results': None}
+        
+        logger.info("병렬 백테스팅 완료")
+        return results
+    
     def get_historical_data(self, symbol, timeframe, start_date, end_date):
         """과거 데이터 가져오기"""
         try:
             # 실제 구현에서는 Binance API를 사용하여 데이터를 가져옴
             # 여기서는 예시로 더미 데이터 생성
-            self.logger.info("과거 데이터 가져오기...")
+            logger.info("과거 데이터 가져오기...")
             
             # 날짜 범위 생성
             start = pd.to_datetime(start_date)
@@ -113,195 +407,123 @@ class BacktestEngine:
             dates = pd.date_range(start=start, end=end, freq=freq)
             
             # 랜덤 가격 데이터 생성 (실제로는 OHLCV 데이터)
-            np.random.seed(42)
+            rng = np.random.default_rng(42)
+            n = len(dates)
             base_price = 50000  # BTC 기준 가격
-            returns = np.random.normal(0, 0.02, len(dates))  # 2% 변동성
-            
-            prices = [base_price]
-            for ret in returns[1:]:
-                prices.append(prices[-1] * (1 + ret))
-            
-            # OHLCV 데이터 생성
-            data = []
-            for i, (date, price) in enumerate(zip(dates, prices)):
-                high = price * (1 + abs(np.random.normal(0, 0.01)))
-                low = price * (1 - abs(np.random.normal(0, 0.01)))
-                open_price = prices[i-1] if i > 0 else price
-                volume = np.random.uniform(100, 1000)
-                
-                data.append({
-                    'timestamp': date,
-                    'open': open_price,
-                    'high': high,
-                    'low': low,
-                    'close': price,
-                    'volume': volume
-                })
-            
-            df = pd.DataFrame(data)
-            df.set_index('timestamp', inplace=True)
+            returns = rng.normal(0, 0.02, n)  # 2% 변동성
+            
+            # 첫 캔들은 기준 가격에서 시작
+            returns[:1] = 0.0
+            prices = base_price * np.cumprod(1.0 + returns)
+            
+            # OHLCV 데이터 생성 (가격/거래량 정밀도는 float32로 충분)
+            highs = (prices * (1 + np.abs(rng.normal(0, 0.01, n)))).astype(np.float32)
+            lows = (prices * (1 - np.abs(rng.normal(0, 0.01, n)))).astype(np.float32)
+            opens = np.empty(n, dtype=np.float32)
+            opens[:1] = prices[:1]
+            opens[1:] = prices[:-1]
+            volumes = rng.uniform(100, 1000, n).astype(np.float32)
+            prices = prices.astype(np.float32)
+            
+            df = pd.DataFrame(
+                {
+                    'open': opens,
+                    'high': highs,
+                    'low': lows,
+                    'close': prices,
+                    'volume': volumes
+                },
+                index=pd.DatetimeIndex(dates, name='timestamp')
+            )
             
-            self.logger.info(f"데이터 로드 완료: {len(df)}개 캔들")
+            logger.info(f"데이터 로드 완료: {len(df)}개 캔들")
             return df
             
         except Exception as e:
-            self.logger.error(f"과거 데이터 가져오기 실패: {e}")
+            logger.error(f"과거 데이터 가져오기 실패: {e}")
             return None
     
     def execute_backtest(self, df, strategy):
         """백테스팅 실행"""
-        try:
-            self.logger.info("백테스팅 실행 중...")
-            
-            for i in range(strategy.long_period, len(df)):
-                current_price = df.iloc[i]['close']
-                current_time = df.index[i]
-                
-                # 손절매/익절매 확인
-                if self.position:
-                    if self.check_exit_conditions(current_price, current_time):
-                        continue
-                
-                # 매수 신호 확인
-                if strategy.should_buy(df, i) and not self.position:
-                    self.execute_buy(current_price, current_time)
-                
-                # 매도 신호 확인
-                elif strategy.should_sell(df, i) and self.position:
-                    self.execute_sell(current_price, current_time)
-                
-                # 자본 곡선 업데이트
-                self.update_equity_curve(current_price, current_time)
-            
-            # 마지막 포지션 정리
-            if self.position:
-                final_price = df.iloc[-1]['close']
-                final_time = df.index[-1]
-                self.execute_sell(final_price, final_time)
-            
-            self.logger.info(f"백테스팅 완료: {len(self.trades)}개 거래 실행")
-            
-        except Exception as e:
-            self.logger.error(f"백테스팅 실행 실패: {e}")
-    
-    def execute_buy(self, price, timestamp):
-        """매수 실행"""
-        try:
-            # 거래 수량 계산 (잔고의 90% 사용)
-            trade_amount = self.balance * 0.9
-            self.position_size = trade_amount / price
-            
-            self.position = 'long'
-            self.entry_price = price
-            self.balance -= trade_amount
-            
-            trade = {
-                'timestamp': timestamp,
-                'type': 'buy',
-                'price': price,
-                'size': self.position_size,
-                'amount': trade_amount,
-                'balance': self.balance
-            }
-            
-            self.trades.append(trade)
-            self.logger.debug(f"매수: {price:.2f} @ {timestamp}")
-            
-        except Exception as e:
-            self.logger.error(f"매수 실행 실패: {e}")
-    
-    def execute_sell(self, price, timestamp):
-        """매도 실행"""
-        try:
-            if not self.position:
-                return
-            
-            # 거래 금액 계산
-            trade_amount = self.position_size * price
-            self.balance += trade_amount
-            
-            # 수익/손실 계산
-            if self.position == 'long':
-                profit = trade_amount - (self.position_size * self.entry_price)
-            else:
-                profit = (self.position_size * self.entry_price) - trade_amount
-            
-            trade = {
-                'timestamp': timestamp,
-                'type': 'sell',
-                'price': price,
-                'size': self.position_size,
-                'amount': trade_amount,
-                'profit': profit,
-                'balance': self.balance
-            }
-            
-            self.trades.append(trade)
-            
-            # 통계 업데이트
-            self.results['total_trades'] += 1
-            if profit > 0:
-                self.results['winning_trades'] += 1
-            else:
-                self.results['losing_trades'] += 1
-            
-            self.logger.debug(f"매도: {price:.2f} @ {timestamp}, 수익: {profit:.2f}")
-            
-            # 포지션 초기화
-            self.position = None
-            self.position_size = 0
-            self.entry_price = 0
-            
-        except Exception as e:
-            self.logger.error(f"매도 실행 실패: {e}")
+        self._simulate(df, strategy, _backtest_core)
     
-    def check_exit_conditions(self, current_price, timestamp):
-        """손절매/익절매 조건 확인"""
-        try:
-            if not self.position:
-                return False
-            
-            # 손절매/익절매 계산
-            if self.position == 'long':
-                stop_loss = self.entry_price * (1 - Config.STOP_LOSS_PERCENT / 100)
-                take_profit = self.entry_price * (1 + Config.TAKE_PROFIT_PERCENT / 100)
-                
-                if current_price <= stop_loss or current_price >= take_profit:
-                    self.execute_sell(current_price, timestamp)
-                    return True
-            
-            return False
-            
-        except Exception as e:
-            self.logger.error(f"청산 조건 확인 실패: {e}")
-            return False
+    def execute_backtest_vectorized(self, df, strategy):
+        """벡터화 백테스팅 실행 (손절매/익절매가 단순 비율일 때 사용 가능)"""
+        self._simulate(df, strategy, _vectorized_core)
     
-    def update_equity_curve(self, current_price, timestamp):
-        """자본 곡선 업데이트"""
-        try:
-            # 현재 자본 계산
-            if self.position:
-                if self.position == 'long':
-                    current_equity = self.balance + (self.position_size * current_price)
+    def _simulate(self, df, strategy, core):
+        """
+        시뮬레이션 코어 실행 및 결과 저장
+        
+        Args:
+            df (pd.DataFrame): 신호가 포함된 데이터프레임
+            strategy (GoldenCrossStrategy): 거래 전략
+            core (callable): _backtest_core 또는 _vectorized_core
+        """
+        logger.info("백테스팅 실행 중...")
+        
+        # 루프 진입 전에 필요한 컬럼을 NumPy 배열로 한 번만 추출
+        # (커널 시그니처는 쓰기 가능 배열만 받으므로 copy-on-write의 읽기 전용 뷰는 복사)
+        closes = np.require(df['close'].to_numpy(dtype=np.float32), requirements='W')
+        times = df.index.values
+        buy_signals = np.require(df['buy_signal'].to_numpy(dtype=np.bool_), requirements='W')
+        sell_signals = np.require(df['exit_signal'].to_numpy(dtype=np.bool_), requirements='W')
+        
+        # 손절매/익절매 배수는 루프 밖에서 한 번만 계산
+        stop_mul = 1.0 - Config.STOP_LOSS_PERCENT / 100.0
+        tp_mul = 1.0 + Config.TAKE_PROFIT_PERCENT / 100.0
+        
+        (trade_idx, trade_type, trade_price, trade_size,
+         trade_profit, trade_balance, equity, equity_idx) = core(
+            closes,
+            buy_signals,
+            sell_signals,
+            int(strategy.long_period),
+            stop_mul,
+            tp_mul,
+            float(self.initial_balance)
+        )
+        
+        # 거래 내역 저장 (필드 단위로 한 번에 기록)
+        trades = np.zeros(len(trade_type), dtype=TRADE_DTYPE)
+        trades['timestamp'] = times[trade_idx]
+        trades['type'] = trade_type
+        trades['price'] = trade_price
+        trades['size'] = trade_size
+        trades['profit'] = trade_profit
+        trades['balance'] = trade_balance
+        self.trades = trades
+        
+        # 자본 곡선 저장
+        self.equity_timestamps = times[equity_idx]
+        self.equity = equity
+        self.equity_prices = closes[equity_idx].astype(np.float64)
+        
+        if len(trade_balance) > 0:
+            self.balance = float(trade_balance[-1])
+        
+        # 통계 업데이트
+        sell_profits = trade_profit[trade_type == TRADE_SELL]
+        self.results['total_trades'] = int(len(sell_profits))
+        self.results['winning_trades'] = int((sell_profits > 0).sum())
+        self.results['losing_trades'] = int((sell_profits <= 0).sum())
+        
+        # 디버그 로그가 꺼져 있으면 거래별 메시지 생성 생략
+        if self._debug:
+            for trade in trades:
+                if trade['type'] == TRADE_BUY:
+                    logger.debug("매수: %.2f @ %s", trade['price'], trade['timestamp'])
                 else:
-                    current_equity = self.balance - (self.position_size * current_price)
-            else:
-                current_equity = self.balance
-            
-            self.equity_curve.append({
-                'timestamp': timestamp,
-                'equity': current_equity,
-                'price': current_price
-            })
-            
-        except Exception as e:
-            self.logger.error(f"자본 곡선 업데이트 실패: {e}")
+                    logger.debug("매도: %.2f @ %s, 수익: %.2f",
+                                 trade['price'], trade['timestamp'], trade['profit'])
+        
+        logger.info(f"백테스팅 완료: {len(self.trades)}개 거래 실행")
     
     def calculate_results(self):
         """백테스팅 결과 계산"""
         try:
-            if not self.trades:
-                self.logger.warning("거래 내역이 없습니다")
+            if len(self.trades) == 0:
+                logger.warning("거래 내역이 없습니다")
                 return
             
             # 총 수익률
@@ -321,76 +543,75 @@ class BacktestEngine:
             self.calculate_profit_factor()
             
         except Exception as e:
-            self.logger.error(f"결과 계산 실패: {e}")
+            logger.error(f"결과 계산 실패: {e}")
     
     def calculate_max_drawdown(self):
         """최대 낙폭 계산"""
-        try:
-            if not self.equity_curve:
-                return
-            
-            equity_values = [point['equity'] for point in self.equity_curve]
-            peak = equity_values[0]
-            max_dd = 0
-            
-            for equity in equity_values:
-                if equity > peak:
-                    peak = equity
-                drawdown = (peak - equity) / peak * 100
-                if drawdown > max_dd:
-                    max_dd = drawdown
-            
-            self.results['max_drawdown'] = max_dd
-            
-        except Exception as e:
-            self.logger.error(f"최대 낙폭 계산 실패: {e}")
+        if len(self.equity) == 0:
+            return
+        
+        equity = self.equity
+        
+        # 누적 최고점 대비 낙폭
+        peak = np.maximum.accumulate(equity)
+        drawdown = np.where(peak > 0, (peak - equity) / peak, 0.0)
+        
+        self.results['max_drawdown'] = float(drawdown.max()) * 100
     
     def calculate_sharpe_ratio(self):
         """샤프 비율 계산"""
-        try:
-            if len(self.equity_curve) < 2:
-                return
-            
-            # 일일 수익률 계산
-            returns = []
-            for i in range(1, len(self.equity_curve)):
-                prev_equity = self.equity_curve[i-1]['equity']
-                curr_equity = self.equity_curve[i]['equity']
-                daily_return = (curr_equity - prev_equity) / prev_equity
-                returns.append(daily_return)
-            
-            if returns:
-                mean_return = np.mean(returns)
-                std_return = np.std(returns)
-                
-                if std_return > 0:
-                    # 무위험 수익률을 0으로 가정
-                    self.results['sharpe_ratio'] = mean_return / std_return * np.sqrt(252)  # 연환산
-            
-        except Exception as e:
-            self.logger.error(f"샤프 비율 계산 실패: {e}")
+        if len(self.equity) < 2:
+            return
+        
+        equity = self.equity
+        
+        # 일일 수익률 계산
+        returns = np.diff(equity) / equity[:-1]
+        std_return = returns.std()
+        
+        if std_return > 0:
+            # 무위험 수익률을 0으로 가정
+            self.results['sharpe_ratio'] = float(returns.mean() / std_return * np.sqrt(252))  # 연환산
     
     def calculate_profit_factor(self):
         """수익 팩터 계산"""
-        try:
-            winning_profits = []
-            losing_profits = []
-            
-            for trade in self.trades:
-                if trade['type'] == 'sell' and 'profit' in trade:
-                    if trade['profit'] > 0:
-                        winning_profits.append(trade['profit'])
-                    else:
-                        losing_profits.append(abs(trade['profit']))
-            
-            total_wins = sum(winning_profits) if winning_profits else 0
-            total_losses = sum(losing_profits) if losing_profits else 0
-            
-            if total_losses > 0:
-                self.results['profit_factor'] = total_wins / total_losses
-            
-        except Exception as e:
-            self.logger.error(f"수익 팩터 계산 실패: {e}")
+        profits = self.trades['profit'][self.trades['type'] == TRADE_SELL]
+        
+        total_wins = float(profits[profits > 0].sum())
+        total_losses = float(-profits[profits <= 0].sum())
+        
+        if total_losses > 0:
+            self.results['profit_factor'] = total_wins / total_losses
+    
+    def get_trades(self):
+        """거래 내역을 딕셔너리 목록으로 반환 (보고/내보내기용)"""
+        trades = []
+        for record in self.trades:
+            trade = {
+                'timestamp': record['timestamp'],
+                'type': 'buy' if record['type'] == TRADE_BUY else 'sell',
+                'price': float(record['price']),
+                'size': float(record['size']),
+                'amount': float(record['size'] * record['price']),
+                'balance': float(record['balance'])
+            }
+            if record['type'] == TRADE_SELL:
+                trade['profit'] = float(record['profit'])
+            trades.append(trade)
+        return trades
+    
+    def get_equity_curve(self):
+        """자본 곡선을 딕셔너리 목록으로 반환 (보고/내보내기용)"""
+        return [
+            {
+                'timestamp': timestamp,
+                'equity': float(equity),
+                'price': float(price)
+            }
+            for timestamp, equity, price in zip(
+                self.equity_timestamps, self.equity, self.equity_prices
+            )
+        ]
     
     def print_results(self):
         """결과 출력"""
@@ -411,7 +632,34 @@ class BacktestEngine:
             print("="*50)
             
         except Exception as e:
-            self.logger.error(f"결과 출력 실패: {e}")
+            logger.error(f"결과 출력 실패: {e}")
+
+def run_single_backtest(params):
+    """
+    단일 백테스팅 실행 (프로세스 풀 작업 단위)
+    
+    Args:
+        params (dict): symbol, timeframe, start_date, end_date 필수,
+                       short_period, long_period, initial_balance 선택
+        
+    Returns:
+        dict: 설정과 결과 딕셔너리
+    """
+    engine = BacktestEngine(
+        initial_balance=params.get('initial_balance', Config.INITIAL_BALANCE)
+    )
+    
+    results = engine.run_backtest(
+        symbol=params['symbol'],
+        timeframe=params['timeframe'],
+        start_date=params['start_date'],
+        end_date=params['end_date'],
+        short_period=params.get('short_period'),
+        long_period=params.get('long_period'),
+        verbose=False
+    )
+    
+    return {'params': params, 'results': results}
 
 def main():
     """백테스팅 메인 함수"""
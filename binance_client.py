@@ -1,4 +1,5 @@
-import ccxt
+import asyncio
+import ccxt.async_support as ccxt_async
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -6,129 +7,256 @@ import time
 import logging
 from config import Config
 
+logger = logging.getLogger(__name__)
+
 class BinanceClient:
     def __init__(self):
         """Binance 클라이언트 초기화"""
-        self.exchange = ccxt.binance({
+        # 모든 요청이 공유하는 거래소 객체 (aiohttp 세션은 첫 요청 시 생성되어 keep-alive로 재사용)
+        self.exchange = self._create_exchange()
+    
+    @staticmethod
+    def _create_exchange():
+        """비동기 ccxt Binance 거래소 객체 생성"""
+        return ccxt_async.binance({
             'apiKey': Config.BINANCE_API_KEY,
             'secret': Config.BINANCE_SECRET_KEY,
             'sandbox': False,  # 실제 거래용 (테스트용은 True)
             'enableRateLimit': True,
         })
         
-        self.logger = logging.getLogger(__name__)
-        
-    def get_account_balance(self):
+    async def get_account_balance(self):
         """계정 잔고 조회"""
         try:
-            balance = self.exchange.fetch_balance()
+            balance = await self.exchange.fetch_balance()
             return balance
         except Exception as e:
-            self.logger.error(f"잔고 조회 실패: {e}")
+            logger.error(f"잔고 조회 실패: {e}")
             return None
     
-    def get_current_price(self, symbol):
+    async def get_current_price(self, symbol):
         """현재 가격 조회"""
         try:
-            ticker = self.exchange.fetch_ticker(symbol)
+            ticker = await self.exchange.fetch_ticker(symbol)
             return ticker['last']
         except Exception as e:
-            self.logger.error(f"가격 조회 실패: {e}")
+            logger.error(f"가격 조회 실패: {e}")
+            return None
+    
+    async def get_server_time(self):
+        """서버 시간 조회 (API 응답 확인용)"""
+        try:
+            return await self.exchange.fetch_time()
+        except Exception as e:
+            logger.error(f"서버 시간 조회 실패: {e}")
+            return None
+    
+    async def get_symbol_info(self, symbol):
+        """
+        심볼 마켓 정보 조회 (최소 주문 수량, 정밀도 등)
+        
+        마켓 목록은 첫 호출 시 한 번만 받아 ccxt가 캐시함
+        """
+        try:
+            await self.exchange.load_markets()
+            return self.exchange.market(symbol)
+        except Exception as e:
+            logger.error(f"심볼 정보 조회 실패: {e}")
             return None
     
-    def get_historical_data(self, symbol, timeframe, limit=100):
+    async def get_historical_data(self, symbol, timeframe, limit=100):
         """과거 데이터 조회"""
         try:
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+            ohlcv = await self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
             df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
             df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
             df.set_index('timestamp', inplace=True)
             return df
         except Exception as e:
-            self.logger.error(f"과거 데이터 조회 실패: {e}")
+            logger.error(f"과거 데이터 조회 실패: {e}")
+            return None
+    
+    async def get_kline(self, symbol, timeframe, limit=2):
+        """
+        최근 캔들 조회 (DataFrame 변환 없이 원본 리스트 반환)
+        
+        Args:
+            symbol (str): 거래 심볼
+            timeframe (str): 시간 프레임
+            limit (int): 캔들 수
+            
+        Returns:
+            list: [timestamp(ms), open, high, low, close, volume] 리스트 (실패 시 None)
+        """
+        try:
+            return await self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+        except Exception as e:
+            logger.error(f"캔들 조회 실패: {e}")
+            return None
+    
+    async def get_historical_data_async(self, symbol, timeframe, start_ms, end_ms, limit=1000, exchange=None):
+        """
+        기간별 과거 데이터 비동기 조회
+        
+        기간을 limit개 캔들 단위 구간으로 나누어 동시에 요청
+        (요청 속도는 ccxt의 enableRateLimit이 제한)
+        
+        Args:
+            symbol (str): 거래 심볼
+            timeframe (str): 시간 프레임
+            start_ms (int): 시작 시각 (밀리초 타임스탬프)
+            end_ms (int): 종료 시각 (밀리초 타임스탬프, 미포함)
+            limit (int): 요청당 최대 캔들 수
+            exchange: 사용할 거래소 객체 (None이면 공유 거래소 객체 사용)
+            
+        Returns:
+            pd.DataFrame: OHLCV 데이터
+        """
+        exchange = exchange or self.exchange
+        
+        try:
+            window_ms = exchange.parse_timeframe(timeframe) * 1000 * limit
+            chunks = await asyncio.gather(*[
+                exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+                for since in range(start_ms, end_ms, window_ms)
+            ])
+            
+            rows = [row for chunk in chunks for row in chunk]
+            ohlcv = np.array(rows, dtype=np.float64).reshape(-1, 6)
+            
+            # 타임스탬프 기준 정렬/중복 제거 후 기간 밖 캔들 제외
+            timestamps, first = np.unique(ohlcv[:, 0].astype(np.int64), return_index=True)
+            ohlcv = ohlcv[first]
+            in_range = timestamps < end_ms
+            ohlcv = ohlcv[in_range]
+            
+            df = pd.DataFrame(
+                {
+                    'open': ohlcv[:, 1],
+                    'high': ohlcv[:, 2],
+                    'low': ohlcv[:, 3],
+                    'close': ohlcv[:, 4],
+                    'volume': ohlcv[:, 5]
+                },
+                index=pd.DatetimeIndex(
+                    pd.to_datetime(timestamps[in_range], unit='ms'), name='timestamp'
+                )
+            )
+            return df
+        except Exception as e:
+            logger.error(f"기간별 과거 데이터 조회 실패: {e}")
             return None
     
-    def place_market_buy_order(self, symbol, amount):
+    def get_historical_range(self, symbol, timeframe, start_date, end_date):
+        """
+        기간별 과거 데이터 조회 (동기 호출용)
+        
+        Args:
+            symbol (str): 거래 심볼
+            timeframe (str): 시간 프레임
+            start_date (str): 시작 날짜 (YYYY-MM-DD)
+            end_date (str): 종료 날짜 (YYYY-MM-DD)
+            
+        Returns:
+            pd.DataFrame: OHLCV 데이터
+        """
+        start_ms = pd.Timestamp(start_date).value // 10**6
+        end_ms = pd.Timestamp(end_date).value // 10**6
+        
+        async def fetch():
+            # 별도 이벤트 루프에서 실행되므로 공유 세션 대신 임시 거래소 객체 사용
+            exchange = self._create_exchange()
+            try:
+                return await self.get_historical_data_async(
+                    symbol, timeframe, start_ms, end_ms, exchange=exchange
+                )
+            finally:
+                await exchange.close()
+        
+        return asyncio.run(fetch())
+    
+    async def place_market_buy_order(self, symbol, amount):
         """시장가 매수 주문"""
         try:
-            order = self.exchange.create_market_buy_order(symbol, amount)
-            self.logger.info(f"매수 주문 성공: {order}")
+            order = await self.exchange.create_market_buy_order(symbol, amount)
+            logger.info(f"매수 주문 성공: {order}")
             return order
         except Exception as e:
-            self.logger.error(f"매수 주문 실패: {e}")
+            logger.error(f"매수 주문 실패: {e}")
             return None
     
-    def place_market_sell_order(self, symbol, amount):
+    async def place_market_sell_order(self, symbol, amount):
         """시장가 매도 주문"""
         try:
-            order = self.exchange.create_market_sell_order(symbol, amount)
-            self.logger.info(f"매도 주문 성공: {order}")
+            order = await self.exchange.create_market_sell_order(symbol, amount)
+            logger.info(f"매도 주문 성공: {order}")
             return order
         except Exception as e:
-            self.logger.error(f"매도 주문 실패: {e}")
+            logger.error(f"매도 주문 실패: {e}")
             return None
     
-    def place_limit_buy_order(self, symbol, amount, price):
+    async def place_limit_buy_order(self, symbol, amount, price):
         """지정가 매수 주문"""
         try:
-            order = self.exchange.create_limit_buy_order(symbol, amount, price)
-            self.logger.info(f"지정가 매수 주문 성공: {order}")
+            order = await self.exchange.create_limit_buy_order(symbol, amount, price)
+            logger.info(f"지정가 매수 주문 성공: {order}")
             return order
         except Exception as e:
-            self.logger.error(f"지정가 매수 주문 실패: {e}")
+            logger.error(f"지정가 매수 주문 실패: {e}")
             return None
     
-    def place_limit_sell_order(self, symbol, amount, price):
+    async def place_limit_sell_order(self, symbol, amount, price):
         """지정가 매도 주문"""
         try:
-            order = self.exchange.create_limit_sell_order(symbol, amount, price)
-            self.logger.info(f"지정가 매도 주문 성공: {order}")
+            order = await self.exchange.create_limit_sell_order(symbol, amount, price)
+            logger.info(f"지정가 매도 주문 성공: {order}")
             return order
         except Exception as e:
-            self.logger.error(f"지정가 매도 주문 실패: {e}")
+            logger.error(f"지정가 매도 주문 실패: {e}")
             return None
     
-    def cancel_order(self, order_id, symbol):
+    async def cancel_order(self, order_id, symbol):
         """주문 취소"""
         try:
-            result = self.exchange.cancel_order(order_id, symbol)
-            self.logger.info(f"주문 취소 성공: {result}")
+            result = await self.exchange.cancel_order(order_id, symbol)
+            logger.info(f"주문 취소 성공: {result}")
             return result
         except Exception as e:
-            self.logger.error(f"주문 취소 실패: {e}")
+            logger.error(f"주문 취소 실패: {e}")
             return None
     
-    def get_open_orders(self, symbol=None):
+    async def get_open_orders(self, symbol=None):
         """미체결 주문 조회"""
         try:
-            orders = self.exchange.fetch_open_orders(symbol)
+            orders = await self.exchange.fetch_open_orders(symbol)
             return orders
         except Exception as e:
-            self.logger.error(f"미체결 주문 조회 실패: {e}")
+            logger.error(f"미체결 주문 조회 실패: {e}")
             return []
     
-    def get_order_status(self, order_id, symbol):
+    async def get_order_status(self, order_id, symbol):
         """주문 상태 조회"""
         try:
-            order = self.exchange.fetch_order(order_id, symbol)
+            order = await self.exchange.fetch_order(order_id, symbol)
             return order
         except Exception as e:
-            self.logger.error(f"주문 상태 조회 실패: {e}")
+            logger.error(f"주문 상태 조회 실패: {e}")
             return None
     
-    def get_trading_fees(self, symbol):
+    async def get_trading_fees(self, symbol):
         """거래 수수료 조회"""
         try:
-            fees = self.exchange.fetch_trading_fees(symbol)
+            fees = await self.exchange.fetch_trading_fees(symbol)
             return fees
         except Exception as e:
-            self.logger.error(f"거래 수수료 조회 실패: {e}")
+            logger.error(f"거래 수수료 조회 실패: {e}")
             return None
     
-    def calculate_order_amount(self, symbol, usdt_amount):
-        """USDT 금액을 기반으로 주문 수량 계산"""
+    async def calculate_order_amount(self, symbol, usdt_amount, current_price=None):
+        """USDT 금액을 기반으로 주문 수량 계산 (current_price가 주어지면 가격 조회 생략)"""
         try:
-            current_price = self.get_current_price(symbol)
+            if current_price is None:
+                current_price = await self.get_current_price(symbol)
             if current_price:
                 # 거래 수수료 고려 (0.1%)
                 fee_rate = 0.001
@@ -137,5 +265,12 @@ class BinanceClient:
                 return amount
             return None
         except Exception as e:
-            self.logger.error(f"주문 수량 계산 실패: {e}")
+            logger.error(f"주문 수량 계산 실패: {e}")
             return None
+    
+    async def close(self):
+        """거래소 연결 종료 (HTTP 세션 정리)"""
+        try:
+            await self.exchange.close()
+        except Exception as e:
+            logger.error(f"거래소 연결 종료 실패: {e}")
@@ -1,13 +1,31 @@
+import atexit
+import copy
 import logging
 import os
+import queue
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from config import Config
 
+class DeferredQueueHandler(QueueHandler):
+    """포맷팅을 리스너 스레드로 미루는 QueueHandler"""
+    
+    def prepare(self, record):
+        """
+        큐에 넣을 레코드 준비
+        
+        기본 구현은 호출 스레드에서 self.format(record)를 실행하므로,
+        레코드를 복사해 msg/args를 그대로 넘기고 포맷팅은 리스너의 핸들러에 맡김
+        (같은 프로세스 안의 큐라 exc_info도 그대로 전달 가능)
+        """
+        return copy.copy(record)
+
 class TradingLogger:
     def __init__(self):
         """로깅 시스템 초기화"""
+        self.listener = None
         self.setup_logging()
+        atexit.register(self.shutdown)
     
     def setup_logging(self):
         """로깅 설정"""
@@ -19,13 +37,17 @@ class TradingLogger:
         # 로그 파일 경로
         log_file = os.path.join(log_dir, Config.LOG_FILE)
         
-        # 로거 설정
+        # 로거 설정 (모듈별 로거가 모두 전파되도록 루트 로거에 레벨/핸들러 설정)
+        root_logger = logging.getLogger()
+        root_logger.setLevel(getattr(logging, Config.LOG_LEVEL))
         self.logger = logging.getLogger('trading_system')
-        self.logger.setLevel(getattr(logging, Config.LOG_LEVEL))
         
         # 기존 핸들러 제거
-        for handler in self.logger.handlers[:]:
-            self.logger.removeHandler(handler)
+        for target in (root_logger, self.logger):
+            for handler in target.handlers[:]:
+                target.removeHandler(handler)
+        if self.listener is not None:
+            self.listener.stop()
         
         # 파일 핸들러 (회전 로그)
         file_handler = RotatingFileHandler(
@@ -48,15 +70,26 @@ class TradingLogger:
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
         
-        # 핸들러 추가
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # 거래 루프 스레드는 큐에 레코드만 넣고, 포맷팅/파일·콘솔 쓰기는 리스너 스레드에서 처리
+        log_queue = queue.SimpleQueue()
+        root_logger.addHandler(DeferredQueueHandler(log_queue))
+        self.listener = QueueListener(
+            log_queue, file_handler, console_handler,
+            respect_handler_level=True
+        )
+        self.listener.start()
         
         # 외부 라이브러리 로그 레벨 조정
         logging.getLogger('ccxt').setLevel(logging.WARNING)
         logging.getLogger('urllib3').setLevel(logging.WARNING)
         logging.getLogger('requests').setLevel(logging.WARNING)
     
+    def shutdown(self):
+        """큐에 남은 로그를 모두 기록한 뒤 리스너 스레드 종료"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+    
     def get_logger(self):
         """로거 인스턴스 반환"""
         return self.logger
@@ -86,9 +119,9 @@ class TradingLogger:
     
     def log_performance(self, stats):
         """성과 로그 기록"""
-        self.logger.info(f"거래 성과 - 총 거래: {stats['total_trades']}, "
-                        f"승률: {stats.get('win_rate', 0):.1f}%, "
-                        f"총 수익: {stats['total_profit']:.2f} USDT")
+        self.logger.info(f"거래 성과 - 총 거래: {stats.total_trades}, "
+                        f"승률: {stats.win_rate:.1f}%, "
+                        f"총 수익: {stats.total_profit:.2f} USDT")
     
     def log_balance(self, balance_info):
         """잔고 로그 기록"""
@@ -6,8 +6,7 @@ Binance 자동화 거래 시스템 - 메인 실행 파일
 
 import sys
 import signal
-import time
-import threading
+import asyncio
 from datetime import datetime
 import logging
 
@@ -47,25 +46,37 @@ class TradingSystem:
             # 시스템 시작
             self.is_running = True
             
-            # 모니터링 스레드 시작
-            monitor_thread = threading.Thread(target=self.monitor.start_monitoring)
-            monitor_thread.daemon = True
-            monitor_thread.start()
+            # 거래 엔진, 모니터링, 상태 확인 루프를 하나의 이벤트 루프에서 실행
+            success = asyncio.run(self.run_tasks())
             
-            # 거래 엔진 시작
-            success = self.trading_engine.start_trading()
-            
-            if success:
-                logger.info("거래 시스템이 성공적으로 시작되었습니다")
-                self.run_main_loop()
-            else:
+            if not success:
                 logger.error("거래 시스템 시작 실패")
-                self.stop_system()
+            self.stop_system()
                 
         except Exception as e:
             logger.error(f"시스템 시작 중 오류 발생: {e}")
             self.stop_system()
     
+    async def run_tasks(self):
+        """
+        거래 엔진, 모니터링, 메인 루프를 동시에 실행
+        
+        Returns:
+            bool: 거래 엔진 시작 성공 여부
+        """
+        try:
+            # 거래 엔진이 먼저 실행 상태가 되어야 모니터링 루프가 바로 종료되지 않음
+            success, _, _ = await asyncio.gather(
+                self.trading_engine.start_trading(),
+                self.monitor.start_monitoring(),
+                self.run_main_loop()
+            )
+        finally:
+            # 이벤트 루프 종료 전에 거래소 HTTP 세션 정리
+            await self.trading_engine.binance_client.close()
+        
+        return success
+    
     def stop_system(self):
         """거래 시스템 중지"""
         logger.info("거래 시스템 중지 중...")
@@ -83,19 +94,16 @@ class TradingSystem:
         
         logger.info("거래 시스템이 안전하게 중지되었습니다")
     
-    def run_main_loop(self):
+    async def run_main_loop(self):
         """메인 실행 루프"""
         try:
-            while self.is_running:
+            while self.is_running and self.trading_engine.is_running:
                 # 시스템 상태 확인
                 self.check_system_status()
                 
-                # 1분마다 상태 체크
-                time.sleep(60)
+                # 1분마다 상태 체크 (거래 엔진 중지 시 즉시 종료)
+                await self.trading_engine.wait_stopped(60)
                 
-        except KeyboardInterrupt:
-            logger.info("사용자에 의해 시스템 중지 요청")
-            self.stop_system()
         except Exception as e:
             logger.error(f"메인 루프 오류: {e}")
             self.stop_system()
@@ -106,9 +114,9 @@ class TradingSystem:
             # 거래 통계 출력
             stats = self.trading_engine.get_trading_stats()
             
-            logger.info(f"거래 통계 - 총 거래: {stats['total_trades']}, "
-                       f"승률: {stats.get('win_rate', 0):.1f}%, "
-                       f"총 수익: {stats['total_profit']:.2f} USDT")
+            logger.info(f"거래 통계 - 총 거래: {stats.total_trades}, "
+                       f"승률: {stats.win_rate:.1f}%, "
+                       f"총 수익: {stats.total_profit:.2f} USDT")
             
             # 모니터링 요약 출력
             monitor_summary = self.monitor.get_monitoring_summary()
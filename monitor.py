@@ -1,12 +1,23 @@
-import time
-import json
+import asyncio
+import orjson
 import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import pandas as pd
+import numpy as np
 import logging
 from trading_engine import TradingEngine
 from logger import logger
 
+def _json_default(obj):
+    """orjson이 직접 처리하지 못하는 객체 변환 (알림 deque 등)"""
+    if isinstance(obj, deque):
+        return list(obj)
+    return str(obj)
+
 class TradingMonitor:
     def __init__(self, trading_engine):
         """
@@ -25,7 +36,7 @@ class TradingMonitor:
             'system_status': 'stopped',
             'trades_history': [],
             'performance_metrics': {},
-            'alerts': []
+            'alerts': deque()  # 발생 시각 순으로 추가되므로 오래된 알림은 왼쪽에서 제거
         }
         
         # 알림 임계값
@@ -42,101 +53,143 @@ class TradingMonitor:
             'consecutive_losses': 0,
             'last_reset_time': datetime.now()
         }
+        
+        # 알림 유형별 마지막 추가 시각 (중복 알림 방지, time.monotonic 기준)
+        self._last_alert_ts = {}
+        
+        # 알림별 추가 시각 (time.monotonic 기준, alerts와 같은 순서로 유지)
+        self._alert_ts = deque()
+        
+        # 모니터링 데이터 백그라운드 저장 (쓰기 중 들어온 스냅샷은 최신 것만 유지)
+        self.data_dir = 'monitoring_data'
+        self._writer = ThreadPoolExecutor(max_workers=1)
+        self._write_lock = threading.Lock()
+        self._pending = None
+        self._write_in_flight = False
+        self._writer_closed = False
+        self._dir_ready = False
     
-    def start_monitoring(self):
+    async def start_monitoring(self):
         """모니터링 시작"""
         self.logger.info("거래 모니터링 시작")
         self.monitoring_data['system_status'] = 'running'
         self.monitoring_data['start_time'] = datetime.now()
         
         # 모니터링 루프 시작
-        self.run_monitoring_loop()
+        await self.run_monitoring_loop()
     
     def stop_monitoring(self):
         """모니터링 중지"""
         self.logger.info("거래 모니터링 중지")
         self.monitoring_data['system_status'] = 'stopped'
         self.monitoring_data['last_update'] = datetime.now()
+        
+        # 남은 저장 작업 완료 대기 (이후 저장은 호출한 스레드에서 바로 기록)
+        with self._write_lock:
+            self._writer_closed = True
+        self._writer.shutdown(wait=True)
     
-    def run_monitoring_loop(self):
+    async def run_monitoring_loop(self):
         """모니터링 루프 실행"""
+        # 5분마다 모니터링 (거래 발생 시에는 즉시 성과 지표 갱신)
+        # 주기 계산은 시스템 시계 변경의 영향을 받지 않도록 time.monotonic 사용
+        interval = 300.0
+        next_at = time.monotonic()
+        stats_updated = self.trading_engine.stats_updated
+        
         while self.trading_engine.is_running:
             try:
-                # 시스템 상태 확인
-                self.check_system_health()
+                # 반복마다 현재 시각을 한 번만 조회하여 전달
+                now = datetime.now()
+                
+                # 시스템 상태 확인 (주기 도래 시에만)
+                if time.monotonic() >= next_at:
+                    await self.check_system_health(now)
+                    next_at += interval
                 
                 # 성과 지표 업데이트
-                self.update_performance_metrics()
+                self.update_performance_metrics(now)
                 
                 # 알림 확인
                 self.check_alerts()
                 
                 # 데이터 저장
-                self.save_monitoring_data()
+                self.save_monitoring_data(now)
                 
-                # 5분마다 모니터링
-                time.sleep(300)
+                # 거래 통계 변경 또는 다음 주기 중 먼저 오는 쪽까지 대기
+                timeout = max(0.0, next_at - time.monotonic())
+                try:
+                    await asyncio.wait_for(stats_updated.wait(), timeout=timeout)
+                    stats_updated.clear()
+                except asyncio.TimeoutError:
+                    pass
                 
             except Exception as e:
                 self.logger.error(f"모니터링 루프 오류: {e}")
-                time.sleep(60)  # 오류 발생 시 1분 대기
+                await asyncio.sleep(60)  # 오류 발생 시 1분 대기
+                next_at = time.monotonic()
     
-    def check_system_health(self):
+    async def check_system_health(self, now=None):
         """시스템 상태 확인"""
         try:
-            # API 연결 상태 확인
-            balance = self.trading_engine.binance_client.get_account_balance()
-            if not balance:
+            # API 연결 상태 확인 (잔고 조회와 서버 응답 확인을 동시에 요청)
+            client = self.trading_engine.binance_client
+            balance, server_time = await asyncio.gather(
+                client.get_account_balance(),
+                client.get_server_time()
+            )
+            if not balance or server_time is None:
                 self.error_counters['api_errors'] += 1
-                self.add_alert('api_error', f"API 연결 실패 (오류 횟수: {self.error_counters['api_errors']})")
+                self.add_alert('api_error', f"API 연결 실패 (오류 횟수: {self.error_counters['api_errors']})", now)
             else:
                 self.error_counters['api_errors'] = 0
             
             # 잔고 확인
             usdt_balance = balance.get('USDT', {}).get('free', 0) if balance else 0
             if usdt_balance < self.alert_thresholds['low_balance']:
-                self.add_alert('low_balance', f"잔고 부족: {usdt_balance} USDT")
+                self.add_alert('low_balance', f"잔고 부족: {usdt_balance} USDT", now)
             
             # 거래 엔진 상태 확인
             if not self.trading_engine.is_running:
-                self.add_alert('engine_stopped', "거래 엔진이 중지됨")
+                self.add_alert('engine_stopped', "거래 엔진이 중지됨", now)
             
         except Exception as e:
             self.logger.error(f"시스템 상태 확인 실패: {e}")
     
-    def update_performance_metrics(self):
+    def update_performance_metrics(self, now=None):
         """성과 지표 업데이트"""
         try:
+            now = now or datetime.now()
             stats = self.trading_engine.get_trading_stats()
             
             # 성과 지표 계산
             metrics = {
-                'total_trades': stats['total_trades'],
-                'winning_trades': stats['winning_trades'],
-                'losing_trades': stats['losing_trades'],
-                'win_rate': stats.get('win_rate', 0),
-                'total_profit': stats['total_profit'],
-                'current_drawdown': stats['current_drawdown'],
-                'max_drawdown': stats['max_drawdown'],
-                'last_update': datetime.now()
+                'total_trades': stats.total_trades,
+                'winning_trades': stats.winning_trades,
+                'losing_trades': stats.losing_trades,
+                'win_rate': stats.win_rate,
+                'total_profit': stats.total_profit,
+                'current_drawdown': stats.current_drawdown,
+                'max_drawdown': stats.max_drawdown,
+                'last_update': now
             }
             
             self.monitoring_data['performance_metrics'] = metrics
             
             # 연속 손실 확인
-            if stats['losing_trades'] > 0:
+            if stats.losing_trades > 0:
                 recent_trades = self.get_recent_trades(10)
                 consecutive_losses = self.count_consecutive_losses(recent_trades)
                 self.error_counters['consecutive_losses'] = consecutive_losses
                 
                 if consecutive_losses >= self.alert_thresholds['consecutive_losses']:
                     self.add_alert('consecutive_losses', 
-                                 f"연속 손실 {consecutive_losses}회 발생")
+                                 f"연속 손실 {consecutive_losses}회 발생", now)
             
             # 최대 손실 확인
-            if stats['max_drawdown'] > self.alert_thresholds['max_drawdown']:
+            if stats.max_drawdown > self.alert_thresholds['max_drawdown']:
                 self.add_alert('max_drawdown', 
-                             f"최대 손실 {stats['max_drawdown']:.2f}% 초과")
+                             f"최대 손실 {stats.max_drawdown:.2f}% 초과", now)
             
         except Exception as e:
             self.logger.error(f"성과 지표 업데이트 실패: {e}")
@@ -144,13 +197,14 @@ class TradingMonitor:
     def check_alerts(self):
         """알림 확인 및 처리"""
         try:
-            current_time = datetime.now()
+            current_time = time.monotonic()
             
             # 1시간 이상 된 알림 제거
-            self.monitoring_data['alerts'] = [
-                alert for alert in self.monitoring_data['alerts']
-                if (current_time - alert['timestamp']).seconds < 3600
-            ]
+            alerts = self.monitoring_data['alerts']
+            alert_ts = self._alert_ts
+            while alert_ts and current_time - alert_ts[0] >= 3600:
+                alert_ts.popleft()
+                alerts.popleft()
             
             # 새로운 알림이 있으면 로깅
             for alert in self.monitoring_data['alerts']:
@@ -161,94 +215,130 @@ class TradingMonitor:
         except Exception as e:
             self.logger.error(f"알림 확인 실패: {e}")
     
-    def add_alert(self, alert_type, message):
-        """알림 추가"""
+    def add_alert(self, alert_type, message, now=None):
+        """
+        알림 추가
+        
+        Args:
+            alert_type (str): 알림 유형
+            message (str): 알림 메시지
+            now (datetime): 알림 시각 (호출 측에서 조회한 현재 시각 재사용)
+        """
+        # 중복 알림 방지 (같은 유형은 5분에 한 번)
+        mono = time.monotonic()
+        last = self._last_alert_ts.get(alert_type)
+        if last is not None and mono - last < 300:
+            return
+        
         alert = {
             'type': alert_type,
             'message': message,
-            'timestamp': datetime.now(),
+            'timestamp': (now or datetime.now()).isoformat(),  # 저장 형식으로 한 번만 변환
             'notified': False
         }
         
-        # 중복 알림 방지
-        existing_alerts = [a for a in self.monitoring_data['alerts'] 
-                          if a['type'] == alert_type and 
-                          (datetime.now() - a['timestamp']).seconds < 300]
-        
-        if not existing_alerts:
-            self.monitoring_data['alerts'].append(alert)
+        self._last_alert_ts[alert_type] = mono
+        self._alert_ts.append(mono)
+        self.monitoring_data['alerts'].append(alert)
     
     def get_recent_trades(self, limit=10):
-        """최근 거래 내역 조회"""
+        """최근 거래 손익 조회 (오래된 순 numpy 배열)"""
         try:
-            # 실제 구현에서는 거래 엔진에서 거래 내역을 가져와야 함
-            # 여기서는 예시로 빈 리스트 반환
-            return []
+            return self.trading_engine.get_profit_history(limit)
         except Exception as e:
             self.logger.error(f"최근 거래 내역 조회 실패: {e}")
-            return []
+            return np.empty(0, dtype=np.float32)
     
-    def count_consecutive_losses(self, trades):
-        """연속 손실 횟수 계산"""
-        consecutive_losses = 0
+    def count_consecutive_losses(self, profits):
+        """연속 손실 횟수 계산 (가장 최근 거래부터 손실이 이어진 횟수)"""
+        not_loss = np.asarray(profits) >= 0
         
-        for trade in reversed(trades):
-            if trade.get('profit', 0) < 0:
-                consecutive_losses += 1
-            else:
-                break
+        if not not_loss.any():
+            return len(not_loss)
         
-        return consecutive_losses
+        # 뒤에서부터 처음 손실이 아닌 거래까지의 거리
+        return int(np.argmax(not_loss[::-1]))
     
-    def save_monitoring_data(self):
-        """모니터링 데이터 저장"""
+    def save_monitoring_data(self, now=None):
+        """모니터링 데이터 저장 (직렬화는 바로 수행, 파일 쓰기는 백그라운드 스레드에서 수행하며 중지 후에는 바로 기록)"""
         try:
-            # 데이터 디렉토리 생성
-            data_dir = 'monitoring_data'
-            if not os.path.exists(data_dir):
-                os.makedirs(data_dir)
-            
-            # JSON 파일로 저장
-            filename = f"monitoring_data_{datetime.now().strftime('%Y%m%d')}.json"
-            filepath = os.path.join(data_dir, filename)
+            filename = f"monitoring_data_{(now or datetime.now()).strftime('%Y%m%d')}.json"
+            filepath = os.path.join(self.data_dir, filename)
+            snapshot = self._serialize_state()
             
-            # datetime 객체를 문자열로 변환
-            data_to_save = self.monitoring_data.copy()
-            data_to_save['start_time'] = data_to_save['start_time'].isoformat()
-            data_to_save['last_update'] = data_to_save['last_update'].isoformat()
+            with self._write_lock:
+                self._pending = (filepath, snapshot)
+                # 쓰기 중이면 대기 중인 스냅샷만 교체
+                if self._write_in_flight:
+                    return
+                self._write_in_flight = True
+                closed = self._writer_closed
             
-            for alert in data_to_save['alerts']:
-                alert['timestamp'] = alert['timestamp'].isoformat()
-            
-            if 'last_update' in data_to_save['performance_metrics']:
-                data_to_save['performance_metrics']['last_update'] = \
-                    data_to_save['performance_metrics']['last_update'].isoformat()
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data_to_save, f, ensure_ascii=False, indent=2)
+            if not closed:
+                try:
+                    self._writer.submit(self._write_snapshot)
+                    return
+                except RuntimeError:
+                    # 종료 직후에 들어온 저장은 아래에서 직접 기록
+                    pass
+            self._write_snapshot()
             
         except Exception as e:
             self.logger.error(f"모니터링 데이터 저장 실패: {e}")
     
+    def _serialize_state(self):
+        """모니터링 데이터를 JSON 바이트로 직렬화 (datetime은 orjson이 ISO 형식으로 변환)"""
+        return orjson.dumps(
+            self.monitoring_data,
+            default=_json_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+        )
+    
+    def _write_snapshot(self):
+        """대기 중인 최신 스냅샷을 파일로 저장 (임시 파일 작성 후 교체)"""
+        while True:
+            with self._write_lock:
+                pending = self._pending
+                self._pending = None
+                if pending is None:
+                    self._write_in_flight = False
+                    return
+            
+            filepath, snapshot = pending
+            try:
+                # 데이터 디렉토리 생성 (최초 한 번)
+                if not self._dir_ready:
+                    os.makedirs(self.data_dir, exist_ok=True)
+                    self._dir_ready = True
+                
+                tmp_path = f"{filepath}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(snapshot)
+                os.replace(tmp_path, filepath)
+                
+            except Exception as e:
+                self.logger.error(f"모니터링 데이터 저장 실패: {e}")
+    
     def generate_report(self):
         """거래 보고서 생성"""
         try:
             stats = self.trading_engine.get_trading_stats()
+            now = datetime.now()
             
             report = {
-                'report_date': datetime.now().isoformat(),
+                'report_date': now.isoformat(),
                 'trading_period': {
                     'start_time': self.monitoring_data['start_time'].isoformat(),
-                    'end_time': datetime.now().isoformat(),
-                    'duration_hours': (datetime.now() - self.monitoring_data['start_time']).total_seconds() / 3600
+                    'end_time': now.isoformat(),
+                    'duration_hours': (now - self.monitoring_data['start_time']).total_seconds() / 3600
                 },
                 'performance_summary': {
-                    'total_trades': stats['total_trades'],
-                    'winning_trades': stats['winning_trades'],
-                    'losing_trades': stats['losing_trades'],
-                    'win_rate': stats.get('win_rate', 0),
-                    'total_profit': stats['total_profit'],
-                    'max_drawdown': stats['max_drawdown']
+                    'total_trades': stats.total_trades,
+                    'winning_trades': stats.winning_trades,
+                    'losing_trades': stats.losing_trades,
+                    'win_rate': stats.win_rate,
+                    'total_profit': stats.total_profit,
+                    'max_drawdown': stats.max_drawdown
                 },
                 'system_status': {
                     'status': self.monitoring_data['system_status'],
@@ -256,7 +346,7 @@ class TradingMonitor:
                     'consecutive_losses': self.error_counters['consecutive_losses'],
                     'active_alerts': len([a for a in self.monitoring_data['alerts'] if not a.get('notified', False)])
                 },
-                'strategy_info': stats.get('strategy_info', {})
+                'strategy_info': self.trading_engine.strategy.get_strategy_info()
             }
             
             return report
@@ -0,0 +1,22 @@
+"""
+Numba 선택적 의존성 처리
+numba가 설치되어 있지 않으면 njit 데코레이터가 원본 파이썬 함수를 그대로 반환
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba 미설치 시 사용하는 njit 대체 데코레이터"""
+        # @njit 형태로 바로 적용된 경우
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        # @njit(...) 형태로 인자와 함께 적용된 경우
+        def decorator(func):
+            return func
+
+        return decorator
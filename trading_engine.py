@@ -1,13 +1,32 @@
+import asyncio
+import heapq
 import time
-import schedule
-import threading
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 import pandas as pd
+import numpy as np
 import logging
 from binance_client import BinanceClient
 from trading_strategy import GoldenCrossStrategy
 from config import Config
 
+@dataclass(slots=True)
+class TradeStats:
+    """거래 통계"""
+    total_trades: int = 0
+    winning_trades: int = 0
+    losing_trades: int = 0
+    total_profit: float = 0.0
+    max_drawdown: float = 0.0
+    current_drawdown: float = 0.0
+    
+    @property
+    def win_rate(self):
+        """승률 (%)"""
+        if self.total_trades > 0:
+            return (self.winning_trades / self.total_trades) * 100
+        return 0
+
 class TradingEngine:
     def __init__(self):
         """거래 엔진 초기화"""
@@ -21,38 +40,47 @@ class TradingEngine:
         self.is_running = False
         self.last_signal_time = None
         
+        # 거래 통계 변경 알림 (모니터가 대기)
+        self.stats_updated = asyncio.Event()
+        
+        # 중지 요청 (대기 중인 루프를 즉시 깨움)
+        self.stop_event = asyncio.Event()
+        
         # 거래 통계
-        self.trade_stats = {
-            'total_trades': 0,
-            'winning_trades': 0,
-            'losing_trades': 0,
-            'total_profit': 0.0,
-            'max_drawdown': 0.0,
-            'current_drawdown': 0.0
-        }
-        
-    def start_trading(self):
+        self.trade_stats = TradeStats()
+        
+        # 청산 거래별 손익 기록 (용량이 차면 두 배로 확장)
+        self._profit_history = np.empty(256, dtype=np.float32)
+        self._profit_count = 0
+        
+    async def start_trading(self):
         """거래 시작"""
         self.logger.info("자동 거래 시스템 시작")
         self.is_running = True
+        self.stop_event.clear()
         
         # 설정 검증
         try:
             Config.validate_config()
         except ValueError as e:
-            self.logger.error(f"설정 오류: {e}")
+            self.logger.error("설정 오류: %s", e)
+            self.stop_trading()
             return False
         
         # API 연결 테스트
-        if not self.test_connection():
+        if not await self.test_connection():
             self.logger.error("Binance API 연결 실패")
+            self.stop_trading()
             return False
         
+        # 지표 상태 워밍업 (실패 시 첫 신호 확인에서 다시 시도)
+        await self._warmup()
+        
         # 스케줄러 설정
         self.setup_scheduler()
         
         # 메인 거래 루프 시작
-        self.run_trading_loop()
+        await self.run_trading_loop()
         
         return True
     
@@ -61,85 +89,168 @@ class TradingEngine:
         self.logger.info("자동 거래 시스템 중지")
         self.is_running = False
         
-    def test_connection(self):
+        # 대기 중인 거래 루프와 모니터가 바로 종료되도록 깨움
+        self.stop_event.set()
+        self.stats_updated.set()
+    
+    async def wait_stopped(self, timeout):
+        """
+        중지 요청이 올 때까지 최대 timeout초 대기
+        
+        Args:
+            timeout (float): 최대 대기 시간 (초)
+            
+        Returns:
+            bool: 대기 중 중지 요청 여부
+        """
+        try:
+            await asyncio.wait_for(self.stop_event.wait(), timeout=max(0.0, timeout))
+            return True
+        except asyncio.TimeoutError:
+            return False
+        
+    async def test_connection(self):
         """API 연결 테스트"""
         try:
-            balance = self.binance_client.get_account_balance()
+            balance = await self.binance_client.get_account_balance()
             if balance:
                 self.logger.info("Binance API 연결 성공")
                 return True
             return False
         except Exception as e:
-            self.logger.error(f"API 연결 테스트 실패: {e}")
+            self.logger.error("API 연결 테스트 실패: %s", e)
             return False
     
     def setup_scheduler(self):
         """스케줄러 설정"""
+        now = time.monotonic()
+        
+        # 자정까지 남은 시간 (벽시계 기준으로 한 번만 계산)
+        wall_now = datetime.now()
+        midnight = datetime.combine(wall_now.date() + timedelta(days=1), datetime.min.time())
+        until_midnight = (midnight - wall_now).total_seconds()
+        
+        # (다음 실행 시각(monotonic), 작업 번호, 작업, 실행 주기(초)) 힙
+        self._jobs = []
+        
         # 1분마다 거래 신호 확인
-        schedule.every(1).minutes.do(self.check_trading_signals)
+        heapq.heappush(self._jobs, (now + 60, 0, self.check_trading_signals, 60))
         
         # 1시간마다 포지션 상태 확인
-        schedule.every(1).hours.do(self.check_position_status)
+        heapq.heappush(self._jobs, (now + 3600, 1, self.check_position_status, 3600))
         
         # 매일 자정에 통계 리셋
-        schedule.every().day.at("00:00").do(self.reset_daily_stats)
+        heapq.heappush(self._jobs, (now + until_midnight, 2, self.reset_daily_stats, 86400))
         
-    def run_trading_loop(self):
+    async def run_trading_loop(self):
         """메인 거래 루프"""
         self.logger.info("거래 루프 시작")
         
         while self.is_running:
             try:
-                schedule.run_pending()
-                time.sleep(10)  # 10초마다 스케줄 확인
-            except KeyboardInterrupt:
-                self.logger.info("사용자에 의해 거래 중지")
-                break
+                next_t, job_id, job, interval = self._jobs[0]
+                now = time.monotonic()
+                
+                # 가장 가까운 작업 시각까지 한 번만 대기 (중지 요청 시 즉시 종료)
+                if now < next_t:
+                    if await self.wait_stopped(next_t - now):
+                        break
+                    continue
+                
+                # 다음 실행 예약 후 작업 실행 (밀렸으면 현재 시각 기준으로 예약)
+                next_t += interval
+                if next_t <= now:
+                    next_t = now + interval
+                heapq.heapreplace(self._jobs, (next_t, job_id, job, interval))
+                
+                await job()
+                
             except Exception as e:
-                self.logger.error(f"거래 루프 오류: {e}")
-                time.sleep(30)  # 오류 발생 시 30초 대기
+                self.logger.error("거래 루프 오류: %s", e)
+                await self.wait_stopped(30)  # 오류 발생 시 30초 대기
         
         self.logger.info("거래 루프 종료")
     
-    def check_trading_signals(self):
+    async def check_trading_signals(self):
         """거래 신호 확인"""
         try:
-            # 최신 데이터 가져오기
-            df = self.binance_client.get_historical_data(
-                Config.SYMBOL, 
-                Config.TIMEFRAME, 
-                limit=100
-            )
+            # 최신 바만 반영하여 지표/신호 증분 갱신
+            row = await self._update_live_indicators()
             
-            if df is None or len(df) < self.strategy.long_period:
+            if row is None:
                 self.logger.warning("데이터 부족으로 신호 확인 불가")
                 return
             
-            # 지표 계산
-            df = self.strategy.calculate_indicators(df)
-            df = self.strategy.generate_signals(df)
-            
-            # 현재 인덱스 (가장 최근 데이터)
-            current_index = len(df) - 1
-            current_price = df.iloc[current_index]['close']
+            current_price = row.close
             
             # 손절매/익절매 확인
             if self.strategy.position:
                 sl_tp_result = self.strategy.check_stop_loss_take_profit(current_price)
                 if sl_tp_result:
-                    self.execute_exit_trade(sl_tp_result, current_price)
+                    await self.execute_exit_trade(sl_tp_result, current_price)
                     return
             
             # 새로운 거래 신호 확인
-            if self.strategy.should_buy(df, current_index):
-                self.execute_buy_trade(current_price)
-            elif self.strategy.should_sell(df, current_index):
-                self.execute_sell_trade(current_price)
+            if self.strategy.should_buy(row):
+                await self.execute_buy_trade(current_price)
+            elif self.strategy.should_sell(row):
+                await self.execute_sell_trade(current_price)
                 
         except Exception as e:
-            self.logger.error(f"신호 확인 중 오류: {e}")
+            self.logger.error("신호 확인 중 오류: %s", e)
+    
+    async def _warmup(self):
+        """
+        과거 데이터 일괄 조회로 전략의 증분 지표 상태 초기화
+        
+        Returns:
+            IndicatorSnapshot: 마지막 바의 지표/신호 값 (데이터 부족 시 None)
+        """
+        df = await self.binance_client.get_historical_data(
+            Config.SYMBOL, 
+            Config.TIMEFRAME, 
+            limit=self.strategy.long_period + 50
+        )
+        
+        if df is None or len(df) < self.strategy.long_period:
+            self.logger.warning("데이터 부족으로 지표 워밍업 실패")
+            return None
+        
+        row = self.strategy.warmup(df)
+        self.logger.info("지표 워밍업 완료: %d개 봉", len(df))
+        return row
+    
+    async def _update_live_indicators(self):
+        """
+        전략의 증분 지표 상태 갱신
+        
+        워밍업 이후에는 최근 2개 봉(직전 봉 확정분 + 진행 중인 봉)만 받아 반영하고,
+        워밍업 전이거나 데이터 공백이 생기면 다시 워밍업
+        
+        Returns:
+            IndicatorSnapshot: 현재 바의 지표/신호 값 (데이터 부족 시 None)
+        """
+        last_bar_time = self.strategy.last_bar_time
+        
+        if last_bar_time is not None:
+            klines = await self.binance_client.get_kline(
+                Config.SYMBOL,
+                Config.TIMEFRAME,
+                limit=2
+            )
+            
+            if klines:
+                timestamps = [pd.Timestamp(kline[0], unit='ms') for kline in klines]
+                if timestamps[0] <= last_bar_time:
+                    row = None
+                    for timestamp, kline in zip(timestamps, klines):
+                        row = self.strategy.update_last_bar(timestamp, kline[4], kline[5])
+                    return row
+        
+        # 콜드 스타트 또는 데이터 공백
+        return await self._warmup()
     
-    def execute_buy_trade(self, current_price):
+    async def execute_buy_trade(self, current_price):
         """매수 거래 실행"""
         try:
             # 이미 포지션이 있는지 확인
@@ -147,21 +258,26 @@ class TradingEngine:
                 self.logger.info("이미 포지션이 있어 매수 건너뜀")
                 return
             
-            # 거래 수량 계산
-            balance = self.binance_client.get_account_balance()
+            # 잔고/현재가/심볼 정보 동시 조회 (심볼 정보는 ccxt 마켓 캐시를 미리 채움)
+            balance, price, _ = await asyncio.gather(
+                self.binance_client.get_account_balance(),
+                self.binance_client.get_current_price(Config.SYMBOL),
+                self.binance_client.get_symbol_info(Config.SYMBOL)
+            )
             if not balance:
                 self.logger.error("잔고 조회 실패")
                 return
             
             usdt_balance = balance['USDT']['free']
             if usdt_balance < Config.TRADE_AMOUNT:
-                self.logger.warning(f"USDT 잔고 부족: {usdt_balance}")
+                self.logger.warning("USDT 잔고 부족: %s", usdt_balance)
                 return
             
-            # 주문 수량 계산
-            amount = self.binance_client.calculate_order_amount(
+            # 주문 수량 계산 (조회한 현재가 사용)
+            amount = await self.binance_client.calculate_order_amount(
                 Config.SYMBOL, 
-                Config.TRADE_AMOUNT
+                Config.TRADE_AMOUNT,
+                current_price=price
             )
             
             if not amount:
@@ -169,19 +285,20 @@ class TradingEngine:
                 return
             
             # 매수 주문 실행
-            order = self.binance_client.place_market_buy_order(Config.SYMBOL, amount)
+            order = await self.binance_client.place_market_buy_order(Config.SYMBOL, amount)
             
             if order:
                 self.strategy.update_position('long', current_price)
-                self.trade_stats['total_trades'] += 1
+                self.trade_stats.total_trades += 1
                 self.last_signal_time = datetime.now()
+                self.stats_updated.set()
                 
-                self.logger.info(f"매수 주문 성공: {amount} {Config.SYMBOL} @ {current_price}")
+                self.logger.info("매수 주문 성공: %s %s @ %s", amount, Config.SYMBOL, current_price)
                 
         except Exception as e:
-            self.logger.error(f"매수 거래 실행 실패: {e}")
+            self.logger.error("매수 거래 실행 실패: %s", e)
     
-    def execute_sell_trade(self, current_price):
+    async def execute_sell_trade(self, current_price):
         """매도 거래 실행"""
         try:
             # 포지션이 있는지 확인
@@ -190,7 +307,7 @@ class TradingEngine:
                 return
             
             # 현재 보유 수량 확인
-            balance = self.binance_client.get_account_balance()
+            balance = await self.binance_client.get_account_balance()
             if not balance:
                 self.logger.error("잔고 조회 실패")
                 return
@@ -200,11 +317,11 @@ class TradingEngine:
             asset_balance = balance[base_asset]['free']
             
             if asset_balance <= 0:
-                self.logger.warning(f"{base_asset} 잔고 없음")
+                self.logger.warning("%s 잔고 없음", base_asset)
                 return
             
             # 매도 주문 실행
-            order = self.binance_client.place_market_sell_order(Config.SYMBOL, asset_balance)
+            order = await self.binance_client.place_market_sell_order(Config.SYMBOL, asset_balance)
             
             if order:
                 # 수익/손실 계산
@@ -213,45 +330,47 @@ class TradingEngine:
                 else:
                     profit = (self.strategy.entry_price - current_price) * asset_balance
                 
-                self.trade_stats['total_profit'] += profit
+                self.trade_stats.total_profit += profit
+                self._record_profit(profit)
                 
                 if profit > 0:
-                    self.trade_stats['winning_trades'] += 1
+                    self.trade_stats.winning_trades += 1
                 else:
-                    self.trade_stats['losing_trades'] += 1
+                    self.trade_stats.losing_trades += 1
                 
                 self.strategy.clear_position()
                 self.last_signal_time = datetime.now()
+                self.stats_updated.set()
                 
-                self.logger.info(f"매도 주문 성공: {asset_balance} {Config.SYMBOL} @ {current_price}, "
-                               f"수익: {profit:.2f} USDT")
+                self.logger.info("매도 주문 성공: %s %s @ %s, 수익: %.2f USDT",
+                                 asset_balance, Config.SYMBOL, current_price, profit)
                 
         except Exception as e:
-            self.logger.error(f"매도 거래 실행 실패: {e}")
+            self.logger.error("매도 거래 실행 실패: %s", e)
     
-    def execute_exit_trade(self, exit_reason, current_price):
+    async def execute_exit_trade(self, exit_reason, current_price):
         """손절매/익절매 실행"""
         try:
-            self.logger.info(f"{exit_reason} 조건 만족으로 포지션 청산")
-            self.execute_sell_trade(current_price)
+            self.logger.info("%s 조건 만족으로 포지션 청산", exit_reason)
+            await self.execute_sell_trade(current_price)
             
         except Exception as e:
-            self.logger.error(f"포지션 청산 실패: {e}")
+            self.logger.error("포지션 청산 실패: %s", e)
     
-    def check_position_status(self):
+    async def check_position_status(self):
         """포지션 상태 확인"""
         try:
             if not self.strategy.position:
                 return
             
-            current_price = self.binance_client.get_current_price(Config.SYMBOL)
+            current_price = await self.binance_client.get_current_price(Config.SYMBOL)
             if not current_price:
                 return
             
             # 손절매/익절매 확인
             sl_tp_result = self.strategy.check_stop_loss_take_profit(current_price)
             if sl_tp_result:
-                self.execute_exit_trade(sl_tp_result, current_price)
+                await self.execute_exit_trade(sl_tp_result, current_price)
             
             # 포지션 정보 로깅
             unrealized_pnl = 0
@@ -260,45 +379,63 @@ class TradingEngine:
             else:
                 unrealized_pnl = (self.strategy.entry_price - current_price) * Config.TRADE_AMOUNT / current_price
             
-            self.logger.info(f"포지션 상태: {self.strategy.position}, "
-                           f"진입가: {self.strategy.entry_price:.2f}, "
-                           f"현재가: {current_price:.2f}, "
-                           f"미실현 손익: {unrealized_pnl:.2f} USDT")
+            self.logger.info("포지션 상태: %s, 진입가: %.2f, 현재가: %.2f, 미실현 손익: %.2f USDT",
+                             self.strategy.position, self.strategy.entry_price,
+                             current_price, unrealized_pnl)
             
         except Exception as e:
-            self.logger.error(f"포지션 상태 확인 실패: {e}")
+            self.logger.error("포지션 상태 확인 실패: %s", e)
     
-    def reset_daily_stats(self):
+    def _record_profit(self, profit):
+        """청산 거래 손익 기록"""
+        if self._profit_count == len(self._profit_history):
+            grown = np.empty(len(self._profit_history) * 2, dtype=np.float32)
+            grown[:self._profit_count] = self._profit_history
+            self._profit_history = grown
+        
+        self._profit_history[self._profit_count] = profit
+        self._profit_count += 1
+    
+    def get_profit_history(self, limit=None):
+        """
+        최근 청산 거래 손익 조회
+        
+        Args:
+            limit (int): 최대 개수 (None이면 전체)
+            
+        Returns:
+            np.ndarray: 오래된 순 손익 배열 (내부 버퍼의 뷰)
+        """
+        start = 0 if limit is None else max(0, self._profit_count - limit)
+        return self._profit_history[start:self._profit_count]
+    
+    async def reset_daily_stats(self):
         """일일 통계 리셋"""
         self.logger.info("일일 통계 리셋")
         # 필요한 경우 일일 통계 초기화 로직 추가
     
     def get_trading_stats(self):
-        """거래 통계 반환"""
-        win_rate = 0
-        if self.trade_stats['total_trades'] > 0:
-            win_rate = (self.trade_stats['winning_trades'] / self.trade_stats['total_trades']) * 100
-        
-        return {
-            **self.trade_stats,
-            'win_rate': win_rate,
-            'strategy_info': self.strategy.get_strategy_info(),
-            'last_signal_time': self.last_signal_time
-        }
+        """
+        거래 통계 반환 (복사 없이 엔진의 통계 객체를 그대로 반환)
+        
+        Returns:
+            TradeStats: 거래 통계 (전략 정보는 strategy.get_strategy_info, 마지막 신호 시각은 last_signal_time 참조)
+        """
+        return self.trade_stats
     
-    def emergency_stop(self):
+    async def emergency_stop(self):
         """긴급 중지 및 포지션 청산"""
         self.logger.warning("긴급 중지 실행")
         
         try:
             # 현재 포지션이 있으면 시장가로 청산
             if self.strategy.position:
-                current_price = self.binance_client.get_current_price(Config.SYMBOL)
+                current_price = await self.binance_client.get_current_price(Config.SYMBOL)
                 if current_price:
-                    self.execute_sell_trade(current_price)
+                    await self.execute_sell_trade(current_price)
             
             # 거래 중지
             self.stop_trading()
             
         except Exception as e:
-            self.logger.error(f"긴급 중지 실행 중 오류: {e}")
+            self.logger.error("긴급 중지 실행 중 오류: %s", e)
@@ -1,9 +1,254 @@
 import pandas as pd
 import numpy as np
-import ta
+from collections import namedtuple
 from datetime import datetime
 import logging
 from config import Config
+from numba_compat import njit
+
+# 손절매/익절매 배수 (Config 값은 실행 중 바뀌지 않으므로 모듈 로드 시 한 번만 계산)
+_SL_LONG = 1.0 - Config.STOP_LOSS_PERCENT / 100.0
+_TP_LONG = 1.0 + Config.TAKE_PROFIT_PERCENT / 100.0
+_SL_SHORT = 1.0 + Config.STOP_LOSS_PERCENT / 100.0
+_TP_SHORT = 1.0 - Config.TAKE_PROFIT_PERCENT / 100.0
+
+@njit('f8[:](f8[:], i8)', cache=True)
+def _sma(x, w):
+    """
+    단순 이동평균 계산 (슬라이딩 윈도우 누적합, O(N))
+    
+    Args:
+        x (np.ndarray): 입력 배열
+        w (int): 윈도우 크기
+        
+    Returns:
+        np.ndarray: 이동평균 배열 (처음 w-1개는 NaN)
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    if w <= 0 or n < w:
+        return out
+    
+    s = 0.0
+    for i in range(w):
+        s += x[i]
+    out[w - 1] = s / w
+    
+    for i in range(w, n):
+        s += x[i] - x[i - w]
+        out[i] = s / w
+    
+    return out
+
+@njit('f8[:](f8[:], i8)', cache=True)
+def _rolling_std(x, w):
+    """
+    이동 표준편차 계산 (모표준편차, 누적합/제곱합 슬라이딩 윈도우, O(N))
+    
+    Args:
+        x (np.ndarray): 입력 배열
+        w (int): 윈도우 크기
+        
+    Returns:
+        np.ndarray: 이동 표준편차 배열 (처음 w-1개는 NaN)
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    if w <= 0 or n < w:
+        return out
+    
+    s = 0.0
+    sq = 0.0
+    for i in range(n):
+        s += x[i]
+        sq += x[i] * x[i]
+        if i >= w:
+            s -= x[i - w]
+            sq -= x[i - w] * x[i - w]
+        if i >= w - 1:
+            mean = s / w
+            out[i] = np.sqrt(max(sq / w - mean * mean, 0.0))
+    
+    return out
+
+@njit('f8[:](f8[:], f8, i8)', cache=True)
+def _ewm(x, alpha, min_periods):
+    """
+    지수 가중 이동평균 계산 (pandas ewm(adjust=False) 방식)
+    
+    Args:
+        x (np.ndarray): 입력 배열 (앞쪽 NaN은 건너뜀)
+        alpha (float): 평활 계수
+        min_periods (int): 값을 출력하기 위한 최소 관측 수
+        
+    Returns:
+        np.ndarray: 지수 이동평균 배열
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    value = np.nan
+    count = 0
+    
+    for i in range(n):
+        if np.isnan(x[i]):
+            if count >= min_periods:
+                out[i] = value
+            continue
+        
+        if count == 0:
+            value = x[i]
+        else:
+            value = alpha * x[i] + (1.0 - alpha) * value
+        count += 1
+        
+        if count >= min_periods:
+            out[i] = value
+    
+    return out
+
+@njit('f8[:](f8[:], i8)', cache=True)
+def _rsi(close, w):
+    """
+    RSI 계산 (Wilder 평활, 한 번의 순회로 상승/하락 평균 갱신)
+    
+    Args:
+        close (np.ndarray): 종가 배열
+        w (int): RSI 기간
+        
+    Returns:
+        np.ndarray: RSI 배열 (처음 w-1개는 NaN)
+    """
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    alpha = 1.0 / w
+    avg_gain = 0.0
+    avg_loss = 0.0
+    
+    for i in range(n):
+        change = close[i] - close[i - 1] if i > 0 else 0.0
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        
+        if i == 0:
+            avg_gain = gain
+            avg_loss = loss
+        else:
+            avg_gain = alpha * gain + (1.0 - alpha) * avg_gain
+            avg_loss = alpha * loss + (1.0 - alpha) * avg_loss
+        
+        if i >= w - 1:
+            if avg_loss == 0:
+                out[i] = 100.0
+            else:
+                out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    
+    return out
+
+@njit('Tuple((b1, b1, b1))(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)', cache=True)
+def _signal_flags(close, volume, ma_short, ma_long, prev_ma_short, prev_ma_long,
+                  rsi, bb_upper, bb_lower, macd, macd_signal, prev_macd, prev_macd_signal,
+                  volume_ma):
+    """
+    한 바의 지표 값으로 거래 신호 판정 (generate_signals와 같은 조건)
+    
+    Returns:
+        tuple: (buy_signal, sell_signal, force_sell)
+    """
+    golden_cross = ma_short > ma_long and prev_ma_short <= prev_ma_long
+    dead_cross = ma_short < ma_long and prev_ma_short >= prev_ma_long
+    macd_bullish = macd > macd_signal and prev_macd <= prev_macd_signal
+    macd_bearish = macd < macd_signal and prev_macd >= prev_macd_signal
+    volume_condition = volume > volume_ma
+    
+    buy_signal = (
+        golden_cross and
+        not rsi > 70 and
+        not close > bb_upper and
+        macd_bullish and
+        volume_condition
+    )
+    
+    sell_signal = (
+        dead_cross and
+        not rsi < 30 and
+        not close < bb_lower and
+        macd_bearish and
+        volume_condition
+    )
+    
+    force_sell = rsi > 80 or close > bb_upper * 1.02
+    
+    return buy_signal, sell_signal, force_sell
+
+@njit('Tuple((b1[:], b1[:], b1[:]))(f8[:], f8[:], f8[:], f8[:], f8[:], f8[:], f8[:], f8[:], f8[:], f8[:])',
+      cache=True, boundscheck=False)
+def _signals(close, volume, ma_short, ma_long, rsi, bb_upper, bb_lower, macd, macd_signal, volume_ma):
+    """
+    전체 구간 거래 신호 계산 (조건별 중간 배열 없이 한 번의 루프)
+    
+    Returns:
+        tuple: (buy_signal, sell_signal, force_sell) 불리언 배열
+    """
+    n = close.shape[0]
+    buy = np.zeros(n, dtype=np.bool_)
+    sell = np.zeros(n, dtype=np.bool_)
+    force = np.zeros(n, dtype=np.bool_)
+    
+    # 첫 바는 직전 값이 없으므로 NaN과 비교 (교차 조건은 항상 거짓)
+    prev_ma_short = np.nan
+    prev_ma_long = np.nan
+    prev_macd = np.nan
+    prev_macd_signal = np.nan
+    
+    for i in range(n):
+        buy[i], sell[i], force[i] = _signal_flags(
+            close[i], volume[i], ma_short[i], ma_long[i], prev_ma_short, prev_ma_long,
+            rsi[i], bb_upper[i], bb_lower[i], macd[i], macd_signal[i],
+            prev_macd, prev_macd_signal, volume_ma[i]
+        )
+        prev_ma_short = ma_short[i]
+        prev_ma_long = ma_long[i]
+        prev_macd = macd[i]
+        prev_macd_signal = macd_signal[i]
+    
+    return buy, sell, force
+
+# 지표/신호 값 묶음 (일괄 계산이면 필드가 배열, 실시간 바면 스칼라)
+# 스냅샷 필드 구분 (입력/지표는 float64 배열, 신호는 bool 배열)
+_INPUT_FIELDS = ('close', 'volume')
+_INDICATOR_FIELDS = (
+    'ma_short', 'ma_long', 'rsi',
+    'bb_upper', 'bb_lower', 'bb_middle',
+    'macd', 'macd_signal', 'macd_histogram',
+    'volume_ma'
+)
+_FLOAT_FIELDS = _INPUT_FIELDS + _INDICATOR_FIELDS
+_SIGNAL_FIELDS = ('buy_signal', 'sell_signal', 'force_sell', 'exit_signal')
+
+IndicatorSnapshot = namedtuple(
+    'IndicatorSnapshot', _FLOAT_FIELDS + _SIGNAL_FIELDS,
+    defaults=(None,) * len(_SIGNAL_FIELDS)
+)
+
+# 스냅샷 필드와 데이터프레임 컬럼 이름 대응
+_SNAPSHOT_COLUMNS = {
+    'close': 'close',
+    'volume': 'volume',
+    'ma_short': 'MA_short',
+    'ma_long': 'MA_long',
+    'rsi': 'RSI',
+    'bb_upper': 'BB_upper',
+    'bb_lower': 'BB_lower',
+    'bb_middle': 'BB_middle',
+    'macd': 'MACD',
+    'macd_signal': 'MACD_signal',
+    'macd_histogram': 'MACD_histogram',
+    'volume_ma': 'Volume_MA',
+    'buy_signal': 'buy_signal',
+    'sell_signal': 'sell_signal',
+    'force_sell': 'force_sell',
+    'exit_signal': 'exit_signal'
+}
 
 class GoldenCrossStrategy:
     def __init__(self, short_period=10, long_period=30):
@@ -23,10 +268,86 @@ class GoldenCrossStrategy:
         self.entry_price = None
         self.stop_loss_price = None
         self.take_profit_price = None
+        self._clear_sl_tp_thresholds()
         
+        # 마지막 generate_signals 결과의 배열 스냅샷 (should_buy/should_sell 조회용)
+        self._last_signal_row = None
+        self._last_signal_index = None
+        
+        # 실시간 증분 지표 상태
+        self.reset_live_state()
+        
+    def calculate_indicators_arrays(self, close, volume):
+        """
+        기술적 지표 계산 (numpy 배열 입출력)
+        
+        Args:
+            close (np.ndarray): 종가 배열
+            volume (np.ndarray): 거래량 배열
+            
+        Returns:
+            IndicatorSnapshot: 지표 배열 묶음 (신호 필드는 None)
+        """
+        # 커널 시그니처는 쓰기 가능 배열만 받으므로 읽기 전용 뷰(pandas copy-on-write)는 복사
+        close = np.require(close, dtype=np.float64, requirements='W')
+        volume = np.require(volume, dtype=np.float64, requirements='W')
+        
+        # 볼린저 밴드 (추가 필터링용)
+        bb_middle = _sma(close, 20)
+        bb_std = _rolling_std(close, 20)
+        
+        # MACD (추가 필터링용)
+        macd = _ewm(close, 2.0 / 13, 12) - _ewm(close, 2.0 / 27, 26)
+        macd_signal = _ewm(macd, 2.0 / 10, 9)
+        
+        return IndicatorSnapshot(
+            close=close,
+            volume=volume,
+            # 이동평균선
+            ma_short=_sma(close, self.short_period),
+            ma_long=_sma(close, self.long_period),
+            # RSI (추가 필터링용)
+            rsi=_rsi(close, 14),
+            bb_upper=bb_middle + 2 * bb_std,
+            bb_lower=bb_middle - 2 * bb_std,
+            bb_middle=bb_middle,
+            macd=macd,
+            macd_signal=macd_signal,
+            macd_histogram=macd - macd_signal,
+            # 거래량 이동평균
+            volume_ma=_sma(volume, 20)
+        )
+    
+    def generate_signals_arrays(self, snapshot):
+        """
+        거래 신호 생성 (numpy 배열 입출력)
+        
+        Args:
+            snapshot (IndicatorSnapshot): calculate_indicators_arrays 결과
+            
+        Returns:
+            IndicatorSnapshot: 신호 배열이 채워진 스냅샷
+        """
+        # 골든크로스/데드크로스, RSI/볼린저 밴드/MACD/거래량 필터를 한 번의 루프로 계산
+        # (읽기 전용 배열은 커널 시그니처에 맞게 쓰기 가능 배열로 복사)
+        buy_signal, sell_signal, force_sell = _signals(*[
+            np.require(getattr(snapshot, field), dtype=np.float64, requirements='W')
+            for field in ('close', 'volume', 'ma_short', 'ma_long', 'rsi', 'bb_upper',
+                          'bb_lower', 'macd', 'macd_signal', 'volume_ma')
+        ])
+        
+        return snapshot._replace(
+            buy_signal=buy_signal,
+            sell_signal=sell_signal,
+            # 강제 청산 신호 (RSI 극도 과매수 또는 볼린저 밴드 상단 2% 돌파)
+            force_sell=force_sell,
+            # 최종 청산 신호 (매도 신호 또는 강제 청산)
+            exit_signal=sell_signal | force_sell
+        )
+    
     def calculate_indicators(self, df):
         """
-        기술적 지표 계산
+        기술적 지표 계산 (데이터프레임용, 백테스팅/리포트에서 사용)
         
         Args:
             df (pd.DataFrame): OHLCV 데이터
@@ -35,37 +356,24 @@ class GoldenCrossStrategy:
             pd.DataFrame: 지표가 추가된 데이터프레임
         """
         try:
-            # 이동평균선 계산
-            df['MA_short'] = ta.trend.sma_indicator(df['close'], window=self.short_period)
-            df['MA_long'] = ta.trend.sma_indicator(df['close'], window=self.long_period)
-            
-            # RSI 계산 (추가 필터링용)
-            df['RSI'] = ta.momentum.rsi(df['close'], window=14)
-            
-            # 볼린저 밴드 (추가 필터링용)
-            bb = ta.volatility.BollingerBands(df['close'], window=20, window_dev=2)
-            df['BB_upper'] = bb.bollinger_hband()
-            df['BB_lower'] = bb.bollinger_lband()
-            df['BB_middle'] = bb.bollinger_mavg()
-            
-            # MACD (추가 필터링용)
-            macd = ta.trend.MACD(df['close'])
-            df['MACD'] = macd.macd()
-            df['MACD_signal'] = macd.macd_signal()
-            df['MACD_histogram'] = macd.macd_diff()
+            snapshot = self.calculate_indicators_arrays(
+                df['close'].to_numpy(dtype=np.float64),
+                df['volume'].to_numpy(dtype=np.float64)
+            )
             
-            # 거래량 이동평균
-            df['Volume_MA'] = ta.volume.volume_sma(df['close'], df['volume'], window=20)
+            # 모든 지표를 계산한 뒤 한 번에 컬럼으로 추가 (원본 OHLCV 컬럼은 유지)
+            for field in _INDICATOR_FIELDS:
+                df[_SNAPSHOT_COLUMNS[field]] = getattr(snapshot, field)
             
             return df
             
         except Exception as e:
-            self.logger.error(f"지표 계산 실패: {e}")
+            self.logger.error("지표 계산 실패: %s", e)
             return df
     
     def generate_signals(self, df):
         """
-        거래 신호 생성
+        거래 신호 생성 (calculate_indicators와 같이 전달된 데이터프레임에 컬럼을 직접 추가)
         
         Args:
             df (pd.DataFrame): 지표가 포함된 OHLCV 데이터
@@ -74,115 +382,299 @@ class GoldenCrossStrategy:
             pd.DataFrame: 신호가 추가된 데이터프레임
         """
         try:
-            df = df.copy()
-            
-            # 골든크로스/데드크로스 신호
-            df['golden_cross'] = (
-                (df['MA_short'] > df['MA_long']) & 
-                (df['MA_short'].shift(1) <= df['MA_long'].shift(1))
-            )
-            
-            df['dead_cross'] = (
-                (df['MA_short'] < df['MA_long']) & 
-                (df['MA_short'].shift(1) >= df['MA_long'].shift(1))
-            )
+            snapshot = self.generate_signals_arrays(self._snapshot_from_df(df))
             
-            # 추가 필터링 조건
-            # RSI 조건 (과매수/과매도 방지)
-            rsi_oversold = df['RSI'] < 30
-            rsi_overbought = df['RSI'] > 70
+            for field in _SIGNAL_FIELDS:
+                df[_SNAPSHOT_COLUMNS[field]] = getattr(snapshot, field)
             
-            # 볼린저 밴드 조건
-            bb_oversold = df['close'] < df['BB_lower']
-            bb_overbought = df['close'] > df['BB_upper']
-            
-            # MACD 조건
-            macd_bullish = (df['MACD'] > df['MACD_signal']) & (df['MACD'].shift(1) <= df['MACD_signal'].shift(1))
-            macd_bearish = (df['MACD'] < df['MACD_signal']) & (df['MACD'].shift(1) >= df['MACD_signal'].shift(1))
-            
-            # 거래량 조건 (평균 거래량보다 높아야 함)
-            volume_condition = df['volume'] > df['Volume_MA']
-            
-            # 최종 신호 생성
-            df['buy_signal'] = (
-                df['golden_cross'] & 
-                ~rsi_overbought & 
-                ~bb_overbought & 
-                macd_bullish & 
-                volume_condition
-            )
-            
-            df['sell_signal'] = (
-                df['dead_cross'] & 
-                ~rsi_oversold & 
-                ~bb_oversold & 
-                macd_bearish & 
-                volume_condition
-            )
-            
-            # 강제 청산 신호 (손절매/익절매)
-            df['force_sell'] = (
-                (df['RSI'] > 80) |  # 극도 과매수
-                (df['close'] > df['BB_upper'] * 1.02)  # 볼린저 밴드 상단 돌파
-            )
+            self._last_signal_row = snapshot
+            self._last_signal_index = df.index
             
             return df
             
         except Exception as e:
-            self.logger.error(f"신호 생성 실패: {e}")
+            self.logger.error("신호 생성 실패: %s", e)
             return df
     
-    def should_buy(self, df, current_index):
+    def should_buy(self, data, current_index=None):
         """
         매수 조건 확인
         
         Args:
-            df (pd.DataFrame): 신호가 포함된 데이터프레임
-            current_index (int): 현재 인덱스
+            data (pd.DataFrame | IndicatorSnapshot): 신호가 포함된 데이터프레임,
+                배열 스냅샷, 또는 update_last_bar가 반환한 현재 바 스냅샷
+            current_index (int): 현재 인덱스 (현재 바 스냅샷이면 생략)
             
         Returns:
             bool: 매수 여부
         """
-        if current_index < self.long_period:
+        bar = self._bar_snapshot(data, current_index)
+        if bar is None:
             return False
             
-        current_row = df.iloc[current_index]
-        
         # 매수 신호 확인
-        if current_row['buy_signal']:
-            self.logger.info(f"매수 신호 감지: 가격={current_row['close']:.2f}, "
-                           f"단기MA={current_row['MA_short']:.2f}, "
-                           f"장기MA={current_row['MA_long']:.2f}")
+        if bar.buy_signal:
+            self._log_signal("매수 신호", bar.close, bar.ma_short, bar.ma_long)
             return True
             
         return False
     
-    def should_sell(self, df, current_index):
+    def should_sell(self, data, current_index=None):
         """
         매도 조건 확인
         
         Args:
-            df (pd.DataFrame): 신호가 포함된 데이터프레임
-            current_index (int): 현재 인덱스
+            data (pd.DataFrame | IndicatorSnapshot): 신호가 포함된 데이터프레임,
+                배열 스냅샷, 또는 update_last_bar가 반환한 현재 바 스냅샷
+            current_index (int): 현재 인덱스 (현재 바 스냅샷이면 생략)
             
         Returns:
             bool: 매도 여부
         """
-        if current_index < self.long_period:
+        bar = self._bar_snapshot(data, current_index)
+        if bar is None:
             return False
             
-        current_row = df.iloc[current_index]
-        
         # 매도 신호 확인
-        if current_row['sell_signal'] or current_row['force_sell']:
-            signal_type = "매도 신호" if current_row['sell_signal'] else "강제 청산"
-            self.logger.info(f"{signal_type} 감지: 가격={current_row['close']:.2f}, "
-                           f"단기MA={current_row['MA_short']:.2f}, "
-                           f"장기MA={current_row['MA_long']:.2f}")
+        if bar.exit_signal:
+            signal_type = "매도 신호" if bar.sell_signal else "강제 청산"
+            self._log_signal(signal_type, bar.close, bar.ma_short, bar.ma_long)
             return True
             
         return False
     
+    def _snapshot_from_df(self, df):
+        """데이터프레임 컬럼을 배열 스냅샷으로 변환 (없는 컬럼은 None)"""
+        return IndicatorSnapshot(**{
+            field: (df[column].to_numpy(dtype=np.float64 if field in _FLOAT_FIELDS else None)
+                    if column in df else None)
+            for field, column in _SNAPSHOT_COLUMNS.items()
+        })
+    
+    def _bar_snapshot(self, data, current_index):
+        """
+        신호 판정할 한 바의 스칼라 스냅샷 반환
+        
+        Returns:
+            IndicatorSnapshot: 현재 바 값 (장기 이동평균 기간 이전이면 None)
+        """
+        if current_index is None:
+            return data
+        
+        if current_index < self.long_period:
+            return None
+        
+        # 데이터프레임은 generate_signals가 캐시한 배열 스냅샷에서 조회
+        if isinstance(data, pd.DataFrame):
+            if self._last_signal_row is None or self._last_signal_index is not data.index:
+                self._last_signal_row = self._snapshot_from_df(data)
+                self._last_signal_index = data.index
+            data = self._last_signal_row
+        
+        return IndicatorSnapshot._make(
+            None if values is None else values[current_index] for values in data
+        )
+    
+    def _log_signal(self, signal_type, price, ma_short, ma_long):
+        """신호 감지 로그 기록 (INFO 비활성 시 인자 처리도 생략)"""
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("%s 감지: 가격=%.2f, 단기MA=%.2f, 장기MA=%.2f",
+                             signal_type, price, ma_short, ma_long)
+    
+    def reset_live_state(self):
+        """실시간 증분 지표 상태 초기화"""
+        window = max(self.short_period, self.long_period, 20)
+        
+        # 확정된 최근 바의 종가/거래량 링 버퍼
+        self._close_ring = np.zeros(window)
+        self._vol_ring = np.zeros(20)
+        self._bar_count = 0
+        self._last_close = 0.0
+        
+        # 이동 합계 (이동평균/볼린저 밴드/거래량 평균)
+        self._ma_short_sum = 0.0
+        self._ma_long_sum = 0.0
+        self._bb_sum = 0.0
+        self._bb_sq_sum = 0.0
+        self._vol_sum = 0.0
+        
+        # 지수 이동평균 상태 (MACD/RSI)
+        self._ema12 = 0.0
+        self._ema26 = 0.0
+        self._macd_signal = 0.0
+        self._macd_count = 0
+        self._rsi_avg_gain = 0.0
+        self._rsi_avg_loss = 0.0
+        
+        # 직전 확정 바의 지표 값과 진행 중인 바
+        self._prev_row = None
+        self._pending = None
+        self.last_bar_time = None
+    
+    def warmup(self, df):
+        """
+        과거 데이터로 증분 지표 상태 초기화
+        
+        Args:
+            df (pd.DataFrame): OHLCV 데이터 (마지막 행은 진행 중인 바)
+            
+        Returns:
+            IndicatorSnapshot: 마지막 바의 지표/신호 값 (데이터가 없으면 None)
+        """
+        self.reset_live_state()
+        
+        row = None
+        for timestamp, close, volume in zip(df.index,
+                                            df['close'].to_numpy(dtype=np.float64),
+                                            df['volume'].to_numpy(dtype=np.float64)):
+            row = self.update_last_bar(timestamp, close, volume)
+        
+        return row
+    
+    def update_last_bar(self, timestamp, close, volume):
+        """
+        최신 바 반영 (O(1))
+        
+        같은 타임스탬프면 진행 중인 바의 값을 갱신하고, 새 타임스탬프면
+        직전 바를 확정한 뒤 새 바를 진행 중인 바로 둠
+        
+        Args:
+            timestamp: 바 시작 시각
+            close (float): 종가 (진행 중인 바는 현재가)
+            volume (float): 거래량
+            
+        Returns:
+            IndicatorSnapshot: 현재 바의 지표/신호 값
+        """
+        if self._pending is not None:
+            if timestamp < self._pending[0]:
+                return self._pending[2]
+            if timestamp > self._pending[0]:
+                self._commit_pending()
+        
+        state, row = self._step(float(close), float(volume))
+        self._pending = (timestamp, state, row)
+        self.last_bar_time = timestamp
+        
+        return row
+    
+    def _commit_pending(self):
+        """진행 중이던 바를 확정하여 상태에 반영"""
+        _, state, row = self._pending
+        
+        (self._ma_short_sum, self._ma_long_sum, self._bb_sum, self._bb_sq_sum,
+         self._vol_sum, self._ema12, self._ema26, self._macd_signal,
+         self._macd_count, self._rsi_avg_gain, self._rsi_avg_loss) = state
+        
+        self._close_ring[self._bar_count % len(self._close_ring)] = row.close
+        self._vol_ring[self._bar_count % len(self._vol_ring)] = row.volume
+        self._last_close = row.close
+        self._bar_count += 1
+        self._prev_row = row
+        self._pending = None
+    
+    def _step(self, close, volume):
+        """
+        확정된 상태에 바 하나를 더한 지표 값 계산 (상태는 변경하지 않음)
+        
+        Returns:
+            tuple: (갱신될 상태, 지표/신호 값)
+        """
+        count = self._bar_count
+        n = count + 1
+        ring = self._close_ring
+        
+        def leaving(period):
+            # 새 바가 들어올 때 period 길이 윈도우에서 빠지는 종가
+            return ring[(count - period) % len(ring)] if count >= period else 0.0
+        
+        # 이동 합계 갱신
+        ma_short_sum = self._ma_short_sum + (close - leaving(self.short_period))
+        ma_long_sum = self._ma_long_sum + (close - leaving(self.long_period))
+        bb_out = leaving(20)
+        bb_sum = self._bb_sum + close - bb_out
+        bb_sq_sum = self._bb_sq_sum + close * close - bb_out * bb_out
+        vol_out = self._vol_ring[count % 20] if count >= 20 else 0.0
+        vol_sum = self._vol_sum + (volume - vol_out)
+        
+        # 지수 이동평균 갱신
+        if count == 0:
+            ema12 = close
+            ema26 = close
+            avg_gain = 0.0
+            avg_loss = 0.0
+        else:
+            ema12 = 2.0 / 13 * close + (1.0 - 2.0 / 13) * self._ema12
+            ema26 = 2.0 / 27 * close + (1.0 - 2.0 / 27) * self._ema26
+            change = close - self._last_close
+            gain = change if change > 0 else 0.0
+            loss = -change if change < 0 else 0.0
+            avg_gain = gain / 14 + (1.0 - 1.0 / 14) * self._rsi_avg_gain
+            avg_loss = loss / 14 + (1.0 - 1.0 / 14) * self._rsi_avg_loss
+        
+        macd = np.nan
+        macd_signal = self._macd_signal
+        macd_count = self._macd_count
+        if n >= 26:
+            macd = ema12 - ema26
+            if macd_count == 0:
+                macd_signal = macd
+            else:
+                macd_signal = 2.0 / 10 * macd + (1.0 - 2.0 / 10) * macd_signal
+            macd_count += 1
+        
+        # 지표 값 (기간이 부족하면 NaN)
+        bb_middle = bb_sum / 20 if n >= 20 else np.nan
+        bb_std = np.sqrt(max(bb_sq_sum / 20 - bb_middle * bb_middle, 0.0)) if n >= 20 else np.nan
+        
+        if n < 14:
+            rsi = np.nan
+        elif avg_loss == 0:
+            rsi = 100.0
+        else:
+            rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        
+        ma_short = ma_short_sum / self.short_period if n >= self.short_period else np.nan
+        ma_long = ma_long_sum / self.long_period if n >= self.long_period else np.nan
+        bb_upper = bb_middle + 2 * bb_std
+        bb_lower = bb_middle - 2 * bb_std
+        macd_signal_value = macd_signal if macd_count >= 9 else np.nan
+        volume_ma = vol_sum / 20 if n >= 20 else np.nan
+        
+        # 직전 확정 바와 비교하여 신호 판정
+        prev = self._prev_row
+        buy_signal, sell_signal, force_sell = _signal_flags(
+            close, volume, ma_short, ma_long,
+            prev.ma_short if prev else np.nan, prev.ma_long if prev else np.nan,
+            rsi, bb_upper, bb_lower, macd, macd_signal_value,
+            prev.macd if prev else np.nan, prev.macd_signal if prev else np.nan,
+            volume_ma
+        )
+        
+        row = IndicatorSnapshot(
+            close=close,
+            volume=volume,
+            ma_short=ma_short,
+            ma_long=ma_long,
+            rsi=rsi,
+            bb_upper=bb_upper,
+            bb_lower=bb_lower,
+            bb_middle=bb_middle,
+            macd=macd,
+            macd_signal=macd_signal_value,
+            macd_histogram=macd - macd_signal_value,
+            volume_ma=volume_ma,
+            buy_signal=buy_signal,
+            sell_signal=sell_signal,
+            force_sell=force_sell,
+            exit_signal=sell_signal or force_sell
+        )
+        
+        state = (ma_short_sum, ma_long_sum, bb_sum, bb_sq_sum, vol_sum,
+                 ema12, ema26, macd_signal, macd_count, avg_gain, avg_loss)
+        
+        return state, row
+    
     def calculate_stop_loss_take_profit(self, entry_price, position_type='long'):
         """
         손절매/익절매 가격 계산
@@ -195,13 +687,8 @@ class GoldenCrossStrategy:
             tuple: (stop_loss_price, take_profit_price)
         """
         if position_type == 'long':
-            stop_loss = entry_price * (1 - Config.STOP_LOSS_PERCENT / 100)
-            take_profit = entry_price * (1 + Config.TAKE_PROFIT_PERCENT / 100)
-        else:
-            stop_loss = entry_price * (1 + Config.STOP_LOSS_PERCENT / 100)
-            take_profit = entry_price * (1 - Config.TAKE_PROFIT_PERCENT / 100)
-            
-        return stop_loss, take_profit
+            return entry_price * _SL_LONG, entry_price * _TP_LONG
+        return entry_price * _SL_SHORT, entry_price * _TP_SHORT
     
     def check_stop_loss_take_profit(self, current_price):
         """
@@ -213,19 +700,21 @@ class GoldenCrossStrategy:
         Returns:
             str: 'stop_loss', 'take_profit', 또는 None
         """
-        if self.position == 'long':
-            if current_price <= self.stop_loss_price:
-                return 'stop_loss'
-            elif current_price >= self.take_profit_price:
-                return 'take_profit'
-        elif self.position == 'short':
-            if current_price >= self.stop_loss_price:
-                return 'stop_loss'
-            elif current_price <= self.take_profit_price:
-                return 'take_profit'
+        # 숏 포지션은 부호를 뒤집어 롱과 같은 비교로 처리 (포지션이 없으면 항상 None)
+        price = current_price * self._sl_sign
+        if price <= self._sl_thresh:
+            return 'stop_loss'
+        if price >= self._tp_thresh:
+            return 'take_profit'
                 
         return None
     
+    def _clear_sl_tp_thresholds(self):
+        """손절매/익절매 비교 기준 초기화 (포지션 없음)"""
+        self._sl_sign = 0.0
+        self._sl_thresh = -np.inf
+        self._tp_thresh = np.inf
+    
     def update_position(self, position_type, entry_price):
         """
         포지션 업데이트
@@ -240,10 +729,14 @@ class GoldenCrossStrategy:
             entry_price, position_type
         )
         
-        self.logger.info(f"포지션 업데이트: {position_type}, "
-                        f"진입가: {entry_price:.2f}, "
-                        f"손절가: {self.stop_loss_price:.2f}, "
-                        f"익절가: {self.take_profit_price:.2f}")
+        # 손절매/익절매 확인용 부호와 기준값 미리 계산
+        self._sl_sign = 1.0 if position_type == 'long' else -1.0
+        self._sl_thresh = self.stop_loss_price * self._sl_sign
+        self._tp_thresh = self.take_profit_price * self._sl_sign
+        
+        self.logger.info("포지션 업데이트: %s, 진입가: %.2f, 손절가: %.2f, 익절가: %.2f",
+                         position_type, entry_price,
+                         self.stop_loss_price, self.take_profit_price)
     
     def clear_position(self):
         """포지션 초기화"""
@@ -251,6 +744,7 @@ class GoldenCrossStrategy:
         self.entry_price = None
         self.stop_loss_price = None
         self.take_profit_price = None
+        self._clear_sl_tp_thresholds()
         
     def get_strategy_info(self):
         """전략 정보 반환"""